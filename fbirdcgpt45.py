@@ -1,6 +1,8 @@
 import pygame
 import random
 
+from flappy_sprites import sprites
+
 pygame.init()
 
 # Screen dimensions
@@ -74,12 +76,13 @@ class Pipe:
 
 # Initializing game elements
 def init_game():
-    global bird, pipes, score, ground_height, bg_color
+    global bird, pipes, score, ground_height, bg_color, ground_color
     bird = Bird()
     pipes = [Pipe(WIDTH + 100)]
     score = 0
     ground_height = 50
     bg_color = random.choice(LIGHT_COLORS)
+    ground_color = random.choice(GROUND_COLORS)
 
 
 init_game()
@@ -122,16 +125,14 @@ while running:
                 if score > high_score:
                     high_score = score
 
-    # Drawing
-    screen.fill(bg_color)
+    # Drawing: the sky and ground layer is composed once per game's colours
+    screen.blit(sprites.background(bg_color, ground_color, (WIDTH, HEIGHT), ground_height), (0, 0))
 
     for pipe in pipes:
         pipe.draw()
 
     bird.draw()
 
-    pygame.draw.rect(screen, random.choice(GROUND_COLORS), (0, HEIGHT - ground_height, WIDTH, ground_height))
-
     score_text = font.render(f'Score: {score}', True, (0, 0, 0))
     screen.blit(score_text, (WIDTH - score_text.get_width() - 10, 10))
 
@@ -1,7 +1,14 @@
 import pygame
+import argparse
 import random
 import sys
 
+from flappy_alloc import add_alloc_arguments, prepare_loop
+from flappy_pacing import FramePacer, add_pacing_arguments, open_display, pacing_mode
+from flappy_sprites import sprites
+from flappy_text import Label, NumberLabel, get_font
+from flappy_timing import PhaseTimer
+
 # Initialize Pygame
 pygame.init()
 
@@ -9,20 +16,40 @@ pygame.init()
 SCREEN_WIDTH = 500
 SCREEN_HEIGHT = 600
 FPS = 60
+UNFOCUSED_FPS = 15  # Tick rate while the window is in the background
+IDLE_TIMEOUT_MS = 500  # Longest wait for input on the static game-over screen
 PIPE_SPEED = 3
 PIPE_WIDTH = 60
 PIPE_GAP = 150  # Vertical gap between pipes
 PIPE_DISTANCE = 300  # Horizontal distance between pipes
+GROUND_HEIGHT = 40  # Height of the land strip at the bottom
 BIRD_SIZE = 20  # Base size for the bird's bounding box
 GRAVITY = 0.4  # Gravity pulling the bird down
 FLAP_ACCELERATION = 6  # How much velocity is subtracted when SPACE is pressed
 
 # Font for score display
-FONT = pygame.font.SysFont("Arial", 24, bold=True)
-BIG_FONT = pygame.font.SysFont("Arial", 48, bold=True)
+FONT = get_font("Arial", 24, bold=True)
+BIG_FONT = get_font("Arial", 48, bold=True)
+
+# Cached HUD text: fixed strings are rendered once, scores come from a digit atlas
+SCORE_LABEL = NumberLabel(FONT, "Score: ", (0, 0, 0))
+BEST_SCORE_LABEL = NumberLabel(FONT, "Best Score: ", (0, 0, 0))
+GAME_OVER_LABEL = Label(BIG_FONT, (0, 0, 0), "GAME OVER")
+RESTART_LABEL = Label(FONT, (0, 0, 0), "Press SPACE to restart")
 
 
 # -------------------------- COLOR HELPERS --------------------------
+LAND_COLORS = (
+    (101, 67, 33),  # Dark brown
+    (255, 255, 0),  # Yellow
+)
+PIPE_COLORS = (
+    (0, 100, 0),  # Dark green
+    (210, 180, 140),  # Light brown
+    (64, 64, 64),  # Dark gray
+)
+
+
 def random_light_color():
     """Return a random light (pastel) color."""
     return (
@@ -43,21 +70,42 @@ def random_dark_color():
 
 def get_land_color():
     """Return either dark brown or yellow."""
-    colors = [
-        (101, 67, 33),  # Dark brown
-        (255, 255, 0),  # Yellow
-    ]
-    return random.choice(colors)
+    return random.choice(LAND_COLORS)
 
 
 def get_pipe_color():
     """Return either dark green, light brown, or dark gray."""
-    colors = [
-        (0, 100, 0),  # Dark green
-        (210, 180, 140),  # Light brown
-        (64, 64, 64),  # Dark gray
-    ]
-    return random.choice(colors)
+    return random.choice(PIPE_COLORS)
+
+
+# -------------------------- COLLISION HELPERS --------------------------
+def swept_collision(x, y, w, h, dx, dy, rx, ry, rw, rh):
+    """Swept AABB test: does the w x h box at (x, y) touch the rect (rx, ry,
+    rw, rh) anywhere while moving by (dx, dy)?  Overlap is strict, like
+    pygame.Rect.colliderect.  Takes plain numbers, so callers build no
+    rect tuples per frame."""
+    # Time window within the step in which the boxes overlap horizontally
+    if dx == 0:
+        if not rx - w < x < rx + rw:
+            return False
+        t0, t1 = 0.0, 1.0
+    else:
+        t0 = (rx - w - x) / dx
+        t1 = (rx + rw - x) / dx
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 < 0.0:
+            t0 = 0.0
+        if t1 > 1.0:
+            t1 = 1.0
+        if t0 >= t1:
+            return False
+    # Vertical extent covered during that window
+    y0 = y + dy * t0
+    y1 = y + dy * t1
+    if y0 > y1:
+        y0, y1 = y1, y0
+    return y0 < ry + rh and y1 > ry - h
 
 
 # -------------------------- GAME OBJECTS --------------------------
@@ -65,6 +113,7 @@ class Bird:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_y = y  # Position before the last update, for swept collision
         self.velocity = 0
 
         # Random shape and color
@@ -83,31 +132,14 @@ class Bird:
 
     def update(self):
         """Update bird position by applying gravity and velocity."""
+        self.prev_y = self.y
         self.velocity += GRAVITY
         self.y += self.velocity
 
     def draw(self, surface):
-        """Draw the bird with its shape and color."""
-        if self.shape == "square":
-            pygame.draw.rect(
-                surface,
-                self.color,
-                (self.x - self.width // 2, self.y - self.height // 2,
-                 self.width, self.height)
-            )
-        elif self.shape == "circle":
-            pygame.draw.circle(
-                surface,
-                self.color,
-                (int(self.x), int(self.y)),
-                self.width // 2
-            )
-        else:  # triangle
-            # An upward-pointing triangle
-            point1 = (self.x, self.y - self.height // 2)
-            point2 = (self.x - self.width // 2, self.y + self.height // 2)
-            point3 = (self.x + self.width // 2, self.y + self.height // 2)
-            pygame.draw.polygon(surface, self.color, [point1, point2, point3])
+        """Draw the bird with its shape and color from the sprite cache."""
+        sprite = sprites.bird(self.shape, self.color, self.width)
+        return surface.blit(sprite, (self.x - self.width // 2, self.y - self.height // 2))
 
     def get_rect(self):
         """Return the bounding rectangle for collision detection."""
@@ -121,66 +153,110 @@ class Bird:
 
 class Pipe:
     def __init__(self, x, gap_center, gap_height):
+        self.width = PIPE_WIDTH
+        self.respawn(x, gap_center, gap_height)
+
+    def respawn(self, x, gap_center, gap_height):
+        """Place the pipe at x with a new gap and color.
+
+        Pipes that scroll off are reused this way, so steady play creates
+        no new objects.
+        """
         self.x = x
+        self.prev_x = x
         self.gap_center = gap_center
         self.gap_height = gap_height
-        self.width = PIPE_WIDTH
         self.color = get_pipe_color()
+        self.scored = False
 
     def update(self):
         """Move the pipe to the left."""
+        self.prev_x = self.x
         self.x -= PIPE_SPEED
 
+    def get_blits(self):
+        """Return (source, dest, area) for the top and bottom parts of the pipe.
+
+        Both parts are cut from one cached column of the pipe's color, so a
+        whole frame of pipes can go through Surface.blits().  The bottom part
+        stops at the ground, which is already on the background layer.
+        """
+        ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+        column = sprites.pipe(self.color, self.width, ground_y)
+        bottom_y = self.gap_center + self.gap_height // 2
+        return (
+            (column, (self.x, 0), (0, 0, self.width, self.gap_center - self.gap_height // 2)),
+            (column, (self.x, bottom_y), (0, 0, self.width, ground_y - bottom_y)),
+        )
+
     def draw(self, surface):
         """Draw the top and bottom parts of the pipe."""
-        # Top pipe rectangle
-        top_rect = pygame.Rect(
-            self.x,
-            0,
-            self.width,
-            self.gap_center - self.gap_height // 2
-        )
-        # Bottom pipe rectangle
-        bottom_rect = pygame.Rect(
-            self.x,
-            self.gap_center + self.gap_height // 2,
-            self.width,
-            SCREEN_HEIGHT - (self.gap_center + self.gap_height // 2)
-        )
-        pygame.draw.rect(surface, self.color, top_rect)
-        pygame.draw.rect(surface, self.color, bottom_rect)
+        surface.blits(self.get_blits(), False)
 
     def is_off_screen(self):
         """Check if the pipe has fully moved off the left of the screen."""
         return self.x + self.width < 0
 
-    def check_collision(self, bird_rect):
-        """Check collision with the bird's rectangle."""
-        top_rect = pygame.Rect(
-            self.x,
-            0,
-            self.width,
-            self.gap_center - self.gap_height // 2
-        )
-        bottom_rect = pygame.Rect(
-            self.x,
-            self.gap_center + self.gap_height // 2,
-            self.width,
-            SCREEN_HEIGHT - (self.gap_center + self.gap_height // 2)
-        )
-        return bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect)
+    def check_collision(self, bird):
+        """Check collision with the bird over its whole last step.
+
+        The bird's box is swept from its previous to its current position
+        relative to the pipe, so large steps cannot tunnel through a lip.
+        """
+        gap_top = self.gap_center - self.gap_height // 2
+        gap_bottom = self.gap_center + self.gap_height // 2
+        # Relative to the pipe, the bird also moves right by the pipe's step
+        dx = self.prev_x - self.x
+        dy = bird.y - bird.prev_y
+        x = bird.x - bird.width // 2 - dx
+        y = bird.prev_y - bird.height // 2
+        return (swept_collision(x, y, bird.width, bird.height, dx, dy,
+                                self.x, 0, self.width, gap_top)
+                or swept_collision(x, y, bird.width, bird.height, dx, dy,
+                                   self.x, gap_bottom, self.width, SCREEN_HEIGHT - gap_bottom))
 
 
 # -------------------------- MAIN GAME LOGIC --------------------------
-def main():
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flappy Bird (Randomized)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only repaint and push the screen regions that changed each frame")
+    add_pacing_arguments(parser)
+    parser.add_argument("--timing", action="store_true",
+                        help="start with the per-phase timing overlay shown (F3 toggles it)")
+    parser.add_argument("--timing-csv", metavar="FILE",
+                        help="write every frame's per-phase times in nanoseconds to FILE")
+    add_alloc_arguments(parser)
+    args = parser.parse_args(argv)
+
+    screen, vsync = open_display((SCREEN_WIDTH, SCREEN_HEIGHT), vsync=args.pacing == "vsync")
     pygame.display.set_caption("Flappy Bird (Randomized)")
 
-    clock = pygame.time.Clock()
+    # Paces frames and keeps frame-time statistics.  Physics advances once per
+    # frame, so even with vsync the pacer keeps the game at FPS
+    pacer = FramePacer(FPS, pacing_mode(args.pacing, vsync))
+
+    # Splits every frame into phases for the F3 overlay and --timing-csv
+    timer = PhaseTimer(("events", "update", "collision", "draw", "flip"), args.timing_csv)
+    show_timing = args.timing
+
+    alloc_tracker = None  # set up right before the loop, for --alloc-stats
+
+    def quit_game():
+        timer.close()
+        if args.frame_stats:
+            print(pacer.stats.summary())
+        if alloc_tracker is not None:
+            print(alloc_tracker.summary())
+        pygame.quit()
+        sys.exit()
 
     # Global best score
     best_score = 0
 
+    # Pipes that scrolled off, kept for reuse so steady play allocates nothing
+    spare_pipes = []
+
     def reset_game():
         """Reset and return initial game objects and states."""
         bg_color = random_light_color()
@@ -200,34 +276,68 @@ def main():
 
     # Start a new game
     bird, pipes, score, bg_color, land_color = reset_game()
+
+    # Dirty-rect state: the background layer on screen and the rects drawn over it
+    shown_background = None
+    drawn_rects = []
     game_active = True
 
+    # Freeze the startup objects out of the garbage collector's generations
+    # and, for --alloc-stats, track allocations and GC pauses per frame
+    alloc_tracker = prepare_loop(args.alloc_stats)
+
+    focused = True
     while True:
-        clock.tick(FPS)
-        for event in pygame.event.get():
+        pacer.tick()
+        if alloc_tracker is not None:
+            alloc_tracker.begin_frame()
+        timer.start()
+        # Idle: nothing moves on the game-over screen, so sleep until input
+        # arrives; in the background the game pauses (physics is per frame,
+        # so a lower tick rate would only slow it down) and redraws at a low
+        # tick rate.  Any event ends the wait at once.
+        if not game_active or not focused:
+            events = [pygame.event.wait(IDLE_TIMEOUT_MS if not game_active else 1000 // UNFOCUSED_FPS)]
+            events.extend(pygame.event.get())
+            pacer.idle()
+            timer.start()  # the wait is idle time, not event handling
+        else:
+            events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                focused = True
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                # The window system lost what was on screen (uncovered or
+                # restored); repaint and push the whole window next frame
+                shown_background = None
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
+                    quit_game()
+                if event.key == pygame.K_F3:
+                    show_timing = not show_timing
                 if event.key == pygame.K_SPACE:
                     if game_active:
-                        # Flap if game is active
-                        bird.flap()
+                        # Flap if game is active (and not paused in the background)
+                        if focused:
+                            bird.flap()
                     else:
                         # Restart if the game is over
                         bird, pipes, score, bg_color, land_color = reset_game()
                         game_active = True
+        timer.lap("events")
 
-        if game_active:
+        if game_active and focused:
             # Update the bird
             bird.update()
+            timer.lap("update")
 
             # Collision with ground or out of top bounds
-            bird_rect = bird.get_rect()
-            if bird.y + bird.height // 2 >= SCREEN_HEIGHT - 40:  # Collides with ground
+            if bird.y + bird.height // 2 >= SCREEN_HEIGHT - GROUND_HEIGHT:  # Collides with ground
                 game_active = False
                 if score > best_score:
                     best_score = score
@@ -235,21 +345,26 @@ def main():
                 game_active = False
                 if score > best_score:
                     best_score = score
+            timer.lap("collision")
 
             # Update and manage pipes
             for pipe in pipes:
                 pipe.update()
+            timer.lap("update")
 
             # Check for pipe collisions
             for pipe in pipes:
-                if pipe.check_collision(bird_rect):
+                if pipe.check_collision(bird):
                     game_active = False
                     if score > best_score:
                         best_score = score
                     break
+            timer.lap("collision")
 
-            # Remove off-screen pipes
-            pipes = [p for p in pipes if not p.is_off_screen()]
+            # Retire off-screen pipes in place; all pipes move together, so
+            # the ones off screen are at the front
+            while pipes and pipes[0].is_off_screen():
+                spare_pipes.append(pipes.pop(0))
 
             # Add new pipes if needed
             # If the last pipe is far enough left, add a new one
@@ -259,49 +374,74 @@ def main():
                     # Generate a new pipe
                     new_x = SCREEN_WIDTH
                     new_gap_center = random.randint(150, SCREEN_HEIGHT - 150)
-                    pipes.append(Pipe(new_x, new_gap_center, PIPE_GAP))
+                    if spare_pipes:
+                        new_pipe = spare_pipes.pop()
+                        new_pipe.respawn(new_x, new_gap_center, PIPE_GAP)
+                    else:
+                        new_pipe = Pipe(new_x, new_gap_center, PIPE_GAP)
+                    pipes.append(new_pipe)
 
             # Scoring: if bird just passed the left edge of a pipe, increment
             for pipe in pipes:
                 # if the bird's x is > pipe.x + pipe.width -> meaning we passed it
-                if not hasattr(pipe, 'scored') or pipe.scored is False:
+                if not pipe.scored:
                     if bird.x > pipe.x + pipe.width:
                         score += 1
                         pipe.scored = True
+            timer.lap("update")
 
         # -------------------------- DRAW SECTION --------------------------
-        screen.fill(bg_color)
-
-        # Draw pipes
+        # Static sky and ground layer, composed once per reset's colours
+        background = sprites.background(bg_color, land_color, (SCREEN_WIDTH, SCREEN_HEIGHT), GROUND_HEIGHT)
+        full_redraw = not args.dirty_rects or background is not shown_background
+        if full_redraw:
+            screen.blit(background, (0, 0))
+            shown_background = background
+        else:
+            # Erase last frame's moving objects and text from the background layer
+            screen.blits([(background, rect, rect) for rect in drawn_rects], False)
+        erased_rects = drawn_rects
+        drawn_rects = []
+
+        # Draw pipes in one batched blit
+        pipe_blits = []
         for pipe in pipes:
-            pipe.draw(screen)
-
-        # Draw ground (a rectangle at bottom)
-        pygame.draw.rect(screen, land_color, (0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40))
+            pipe_blits.extend(pipe.get_blits())
+        drawn_rects.extend(screen.blits(pipe_blits))
 
         # Draw bird
-        bird.draw(screen)
+        drawn_rects.append(bird.draw(screen))
 
         # Draw score (top right)
-        score_surface = FONT.render(f"Score: {score}", True, (0, 0, 0))
-        score_rect = score_surface.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-        screen.blit(score_surface, score_rect)
+        drawn_rects.append(SCORE_LABEL.draw(screen, score, topright=(SCREEN_WIDTH - 10, 10)))
 
         # If game over, display best score
         if not game_active:
-            game_over_text = BIG_FONT.render("GAME OVER", True, (0, 0, 0))
+            game_over_text = GAME_OVER_LABEL.render()
             game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
-            screen.blit(game_over_text, game_over_rect)
+            drawn_rects.append(screen.blit(game_over_text, game_over_rect))
 
-            best_score_text = FONT.render(f"Best Score: {best_score}", True, (0, 0, 0))
-            best_score_rect = best_score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
-            screen.blit(best_score_text, best_score_rect)
+            drawn_rects.append(BEST_SCORE_LABEL.draw(screen, best_score,
+                                                     center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10)))
 
-            restart_text = FONT.render("Press SPACE to restart", True, (0, 0, 0))
+            restart_text = RESTART_LABEL.render()
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-            screen.blit(restart_text, restart_rect)
-
-        pygame.display.flip()
+            drawn_rects.append(screen.blit(restart_text, restart_rect))
+
+        # Per-phase timing overlay (top left)
+        if show_timing:
+            drawn_rects.append(timer.draw(screen))
+        timer.lap("draw")
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            # Push only where something was erased or drawn
+            pygame.display.update(erased_rects + drawn_rects)
+        timer.lap("flip")
+        timer.end_frame()
+        if alloc_tracker is not None:
+            alloc_tracker.end_frame()
 
 
 # Run the game
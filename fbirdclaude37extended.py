@@ -1,6 +1,19 @@
 import pygame
 import sys
+import os
+import argparse
 import random
+import math
+import bisect
+import struct
+import time
+from array import array
+
+from flappy_alloc import add_alloc_arguments, prepare_loop
+from flappy_pacing import FramePacer, add_pacing_arguments, open_display, pacing_mode, refresh_rate
+from flappy_scheduler import Scheduler
+from flappy_sprites import sprites
+from flappy_text import Label, NumberLabel, get_font
 
 # Initialize Pygame
 pygame.init()
@@ -8,12 +21,23 @@ pygame.init()
 # Constants
 SCREEN_WIDTH = 400
 SCREEN_HEIGHT = 600
+FPS = 60  # simulation steps per second
+MAX_CATCHUP_STEPS = 5  # most simulation steps run per rendered frame
+FAST_FORWARD_SCALE = 4
+UNFOCUSED_FPS = 15  # frame rate while the window is in the background (the game is paused)
+IDLE_TIMEOUT_MS = 500  # longest wait for input on the static game-over screen
 GRAVITY = 0.5
 JUMP_STRENGTH = -8
 PIPE_SPEED = 3
 PIPE_GAP = 150
 PIPE_FREQUENCY = 1500  # milliseconds
+PIPE_FREQUENCY_FRAMES = PIPE_FREQUENCY * FPS // 1000  # simulation frames between pipes
 GROUND_HEIGHT = 100
+GROUND_Y = SCREEN_HEIGHT - GROUND_HEIGHT  # top of the ground
+BIRD_SIZE = 20
+PIPE_WIDTH = 50
+FIXED_SHIFT = 8  # fixed-point mode stores positions in 1/256 px units
+FIXED_ONE = 1 << FIXED_SHIFT
 
 # Colors
 WHITE = (255, 255, 255)
@@ -25,228 +49,848 @@ DARK_GREEN = (0, 100, 0)
 LIGHT_BROWN = (139, 69, 19)
 DARK_GRAY = (64, 64, 64)
 
+BIRD_SHAPES = ("square", "circle", "triangle")
+GROUND_COLORS = (DARK_BROWN, YELLOW)
+PIPE_COLORS = (DARK_GREEN, LIGHT_BROWN, DARK_GRAY)
+
+# Snapshot layout (little-endian, see Game.snapshot): a header, then one record
+# per pipe, one per scheduled event, and the Mersenne Twister state last.
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<B??IIB3B3B3BdddIIBB")
+SNAPSHOT_PIPE = struct.Struct("<ddh?3B")
+SNAPSHOT_EVENT = struct.Struct("<IIBI")
+SNAPSHOT_RNG = struct.Struct("<625I?d")
+SCHEDULER_ACTIONS = ("spawn_pipe",)
+
+# Replay file layout: header, flap_count uint32 frame indices, then (version 2)
+# the keyframe interval and count, an index of (frame, offset, size) entries
+# and the keyframe snapshots themselves.
+REPLAY_MAGIC = b"FBRP"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct("<4sBQII?I")
+REPLAY_KEYFRAMES = struct.Struct("<II")
+REPLAY_INDEX = struct.Struct("<IQI")
+KEYFRAME_INTERVAL = 600  # frames, 10 seconds of game time
+
 
 # Function to generate random light color
-def random_light_color():
-    return (random.randint(150, 255), random.randint(150, 255), random.randint(150, 255))
+def random_light_color(rng=random):
+    return (rng.randint(150, 255), rng.randint(150, 255), rng.randint(150, 255))
 
 
 # Function to generate random dark color
-def random_dark_color():
-    return (random.randint(0, 100), random.randint(0, 100), random.randint(0, 100))
+def random_dark_color(rng=random):
+    return (rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100))
 
 
 # Function to generate random ground color
-def random_ground_color():
-    return random.choice([DARK_BROWN, YELLOW])
+def random_ground_color(rng=random):
+    return rng.choice(GROUND_COLORS)
 
 
 # Function to generate random pipe color
-def random_pipe_color():
-    return random.choice([DARK_GREEN, LIGHT_BROWN, DARK_GRAY])
-
-
-# Create the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Flappy Bird Clone")
-
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
-
-# Font for score display
-font = pygame.font.Font(None, 36)
+def random_pipe_color(rng=random):
+    return rng.choice(PIPE_COLORS)
+
+
+# Convert pixels (or pixels per frame) to integer fixed-point units
+def to_fixed(value):
+    return round(value * FIXED_ONE)
+
+
+# Time window of one step, as (t0, t1) within [0, 1], in which a box at x of
+# width w moving by dx overlaps the span rx..rx + rw; None if it never does.
+def sweep_window(x, w, dx, rx, rw):
+    if dx == 0:
+        return (0.0, 1.0) if rx - w < x < rx + rw else None
+    t0 = (rx - w - x) / dx
+    t1 = (rx + rw - x) / dx
+    if t0 > t1:
+        t0, t1 = t1, t0
+    t0 = max(t0, 0.0)
+    t1 = min(t1, 1.0)
+    return (t0, t1) if t0 < t1 else None
+
+
+# Font for score display; the HUD text is cached so a frame only re-renders
+# what changed (the score is drawn from a digit atlas)
+FONT_SIZE = 36
+font = get_font(None, FONT_SIZE)
+_hud_labels = {}
+
+
+def hud_labels(zoom=1):
+    """Return the (score, best score, game over, restart, quit) labels for a zoom level, built once."""
+    labels = _hud_labels.get(zoom)
+    if labels is None:
+        hud_font = get_font(None, max(1, round(FONT_SIZE * zoom)))
+        labels = _hud_labels[zoom] = (
+            NumberLabel(hud_font, "Score: ", BLACK),
+            NumberLabel(hud_font, "Best Score: ", BLACK),
+            Label(hud_font, BLACK, "Game Over"),
+            Label(hud_font, BLACK, "Press SPACE to restart"),
+            Label(hud_font, BLACK, "Press Q or ESC to quit"),
+        )
+    return labels
+
+
+HOOK_NAMES = ("on_frame_start", "on_event", "on_update", "on_collision", "on_draw", "on_frame_end")
+
+
+class Hooks:
+    # Callbacks attached to the game loop, for telemetry, profilers and bots:
+    #   on_frame_start(game), on_event(game, event), on_frame_end(game) from main();
+    #   on_update(game) after every simulation step, on_collision(game) when
+    #   the bird crashes, on_draw(game, surface) after Game.draw().
+    # Each hook attribute is None until a callback is added, so with nothing
+    # attached a call site costs one attribute test.
+    def __init__(self):
+        self.callbacks = {name: [] for name in HOOK_NAMES}
+        for name in HOOK_NAMES:
+            setattr(self, name, None)
+
+    def add(self, name, callback):
+        """Attach callback to the named hook and return it."""
+        if name not in self.callbacks:
+            raise ValueError(f"unknown hook {name!r}")
+        self.callbacks[name].append(callback)
+        self._bind(name)
+        return callback
+
+    def remove(self, name, callback):
+        self.callbacks[name].remove(callback)
+        self._bind(name)
+
+    def clear(self):
+        for name in HOOK_NAMES:
+            self.callbacks[name].clear()
+            self._bind(name)
+
+    def _bind(self, name):
+        callbacks = tuple(self.callbacks[name])
+        if not callbacks:
+            dispatch = None
+        elif len(callbacks) == 1:
+            dispatch = callbacks[0]
+        else:
+            def dispatch(*args):
+                for callback in callbacks:
+                    callback(*args)
+        setattr(self, name, dispatch)
+
+
+# Shared by every Game and main(); attach before calling main() to observe a session
+hooks = Hooks()
 
 
 class Bird:
-    def __init__(self):
+    # In fixed-point mode y, prev_y and velocity are integers in 1/FIXED_ONE px;
+    # scale converts them back to pixels.  x and size are always pixels.
+    def __init__(self, rng=random, fixed_point=False):
+        self.scale = FIXED_ONE if fixed_point else 1
+        self.gravity = to_fixed(GRAVITY) if fixed_point else GRAVITY
+        self.jump_strength = to_fixed(JUMP_STRENGTH) if fixed_point else JUMP_STRENGTH
         self.x = SCREEN_WIDTH // 4
-        self.y = SCREEN_HEIGHT // 2
-        self.size = 20
+        self.y = SCREEN_HEIGHT // 2 * self.scale
+        self.prev_y = self.y  # position at the previous step, for render interpolation
+        self.size = BIRD_SIZE
         self.velocity = 0
-        self.shape = random.choice(["square", "circle", "triangle"])
-        self.color = random_dark_color()
+        self.shape = rng.choice(BIRD_SHAPES)
+        self.color = random_dark_color(rng)
 
     def jump(self):
         # Multiple presses will accelerate the bird upward
         # Adding to the current velocity makes it go faster upward
-        self.velocity += JUMP_STRENGTH
+        self.velocity += self.jump_strength
         # Cap the velocity to prevent too rapid acceleration
-        self.velocity = max(self.velocity, JUMP_STRENGTH * 2)
+        self.velocity = max(self.velocity, self.jump_strength * 2)
 
     def update(self):
-        self.velocity += GRAVITY
+        self.prev_y = self.y
+        self.velocity += self.gravity
         self.y += self.velocity
 
-    def draw(self):
-        if self.shape == "square":
-            pygame.draw.rect(screen, self.color,
-                             (self.x - self.size // 2, self.y - self.size // 2, self.size, self.size))
-        elif self.shape == "circle":
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.size // 2)
-        elif self.shape == "triangle":
-            points = [
-                (self.x, self.y - self.size // 2),
-                (self.x - self.size // 2, self.y + self.size // 2),
-                (self.x + self.size // 2, self.y + self.size // 2)
-            ]
-            pygame.draw.polygon(screen, self.color, points)
+    def draw(self, surface, alpha=1.0, zoom=1):
+        # alpha blends between the previous and the current simulation step;
+        # zoom scales the drawing, e.g. for a small cell of a grid view
+        y = (self.prev_y + (self.y - self.prev_y) * alpha) / self.scale
+        size = self.size if zoom == 1 else max(1, round(self.size * zoom))
+        # The shape is rasterised once and cached; drawing is a single blit
+        sprite = sprites.bird(self.shape, self.color, size)
+        surface.blit(sprite, (self.x * zoom - size // 2, y * zoom - size // 2))
 
     def get_rect(self):
+        y = self.y / self.scale
         if self.shape == "square":
-            return pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
+            return pygame.Rect(self.x - self.size // 2, y - self.size // 2, self.size, self.size)
         elif self.shape == "circle":
-            return pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
+            return pygame.Rect(self.x - self.size // 2, y - self.size // 2, self.size, self.size)
         elif self.shape == "triangle":
-            return pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
+            return pygame.Rect(self.x - self.size // 2, y - self.size // 2, self.size, self.size)
 
 
 class Pipe:
-    def __init__(self, x):
-        self.x = x
-        self.gap_y = random.randint(200, SCREEN_HEIGHT - GROUND_HEIGHT - 200)
-        self.width = 50
+    # x is given in pixels; in fixed-point mode x and prev_x are stored in
+    # 1/FIXED_ONE px units like the bird's y.
+    def __init__(self, x, rng=random, fixed_point=False):
+        self.scale = FIXED_ONE if fixed_point else 1
+        self.speed = to_fixed(PIPE_SPEED) if fixed_point else float(PIPE_SPEED)
+        self.width = PIPE_WIDTH
+        self.respawn(x, rng)
+
+    def respawn(self, x, rng=random):
+        # (Re)place the pipe at x with a new gap and colour, so Game can reuse
+        # pipes that scrolled off instead of allocating new ones
+        self.x = x * self.scale
+        self.prev_x = self.x
+        self.gap_y = rng.randint(200, SCREEN_HEIGHT - GROUND_HEIGHT - 200)
         self.passed = False
-        self.color = random_pipe_color()
+        self.color = random_pipe_color(rng)
+
+    @classmethod
+    def from_state(cls, x, prev_x, gap_y, passed, color, fixed_point=False):
+        pipe = cls.__new__(cls)
+        pipe.scale = FIXED_ONE if fixed_point else 1
+        pipe.speed = to_fixed(PIPE_SPEED) if fixed_point else float(PIPE_SPEED)
+        pipe.x = x
+        pipe.prev_x = prev_x
+        pipe.gap_y = gap_y
+        pipe.width = PIPE_WIDTH
+        pipe.passed = passed
+        pipe.color = color
+        return pipe
 
     def update(self):
-        self.x -= PIPE_SPEED
-
-    def draw(self):
-        # Draw top pipe
-        pygame.draw.rect(screen, self.color, (self.x, 0, self.width, self.gap_y - PIPE_GAP // 2))
-        # Draw bottom pipe
-        pygame.draw.rect(screen, self.color, (
-        self.x, self.gap_y + PIPE_GAP // 2, self.width, SCREEN_HEIGHT - (self.gap_y + PIPE_GAP // 2) - GROUND_HEIGHT))
+        self.prev_x = self.x
+        self.x -= self.speed
+
+    def get_blits(self, alpha=1.0, zoom=1):
+        # (source, dest, area) for the top and bottom pipe, both cut from one
+        # cached full-height column, ready for Surface.blits()
+        x = (self.prev_x + (self.x - self.prev_x) * alpha) / self.scale
+        upper = self.gap_y - PIPE_GAP // 2
+        lower = self.gap_y + PIPE_GAP // 2
+        ground = SCREEN_HEIGHT - GROUND_HEIGHT
+        width = self.width
+        if zoom != 1:
+            x *= zoom
+            upper, lower, ground, width = (round(v * zoom) for v in (upper, lower, ground, width))
+        column = sprites.pipe(self.color, width, ground)
+        return ((column, (x, 0), (0, 0, width, upper)),
+                (column, (x, lower), (0, 0, width, ground - lower)))
+
+    def draw(self, surface, alpha=1.0, zoom=1):
+        surface.blits(self.get_blits(alpha, zoom), False)
 
     def is_offscreen(self):
-        return self.x + self.width < 0
+        return self.x + self.width * self.scale < 0
 
     def get_rects(self):
-        top_rect = pygame.Rect(self.x, 0, self.width, self.gap_y - PIPE_GAP // 2)
-        bottom_rect = pygame.Rect(self.x, self.gap_y + PIPE_GAP // 2, self.width,
+        x = self.x / self.scale
+        top_rect = pygame.Rect(x, 0, self.width, self.gap_y - PIPE_GAP // 2)
+        bottom_rect = pygame.Rect(x, self.gap_y + PIPE_GAP // 2, self.width,
                                   SCREEN_HEIGHT - (self.gap_y + PIPE_GAP // 2) - GROUND_HEIGHT)
         return [top_rect, bottom_rect]
 
 
+class CourseIndex:
+    # Precomputed pipe constraints along the bird's path.  The bird's world x
+    # advances one pipe step per frame, so each world column it visits is a
+    # future frame: slot (frame & mask) holds, for the step ending at that
+    # frame, the sweep window (t0, t1) in which the bird overlaps a pipe and
+    # the gap's free range for the bird's top edge (top < y_top < bottom).
+    # Steps without a pipe have an unbounded range.  Pipes are written in when
+    # they spawn and each slot is released once its step has been checked.
+    def __init__(self, scale, speed):
+        self.scale = scale
+        self.speed = speed  # pipe step in game units
+        if PIPE_FREQUENCY_FRAMES * PIPE_SPEED <= PIPE_WIDTH + BIRD_SIZE + PIPE_SPEED:
+            raise ValueError("Pipes are too close together for one pipe per step")
+        lookahead = (SCREEN_WIDTH + PIPE_WIDTH) // PIPE_SPEED + 2
+        self.size = 1 << lookahead.bit_length()
+        self.mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        self.t0 = array("d", [0.0]) * self.size
+        self.t1 = array("d", [1.0]) * self.size
+        self.top = array("d", [-math.inf]) * self.size
+        self.bottom = array("d", [math.inf]) * self.size
+
+    def release(self, i):
+        self.top[i] = -math.inf
+        self.bottom[i] = math.inf
+
+    def add(self, x, gap_y, frame):
+        """Record a pipe whose left edge is at x (game units) at the end of step frame."""
+        scale = self.scale
+        speed = self.speed
+        dx = speed / scale
+        left = SCREEN_WIDTH // 4 - BIRD_SIZE // 2 - dx  # bird box at the start of a step, relative to the pipe
+        # Skip the steps before the pipe can reach the bird
+        skip = max(0, int((x / scale - left - BIRD_SIZE) // dx) - 1)
+        x -= skip * speed
+        frame += 1 + skip
+        x -= speed
+        while x / scale + PIPE_WIDTH > left:
+            window = sweep_window(left, BIRD_SIZE, dx, x / scale, PIPE_WIDTH)
+            if window is not None:
+                i = frame & self.mask
+                self.t0[i], self.t1[i] = window
+                self.top[i] = gap_y - PIPE_GAP // 2
+                self.bottom[i] = gap_y + PIPE_GAP // 2 - BIRD_SIZE
+            frame += 1
+            x -= speed
+
+
 class Game:
-    def __init__(self):
+    # The simulation (reset/update/step) never touches the display, the clock
+    # or the event queue, so it can be driven headless at full speed.
+    # With fixed_point=True bird y/velocity and pipe x are integers in
+    # 1/FIXED_ONE px, which makes runs bit-identical on every platform.
+    # Once running, update() creates no objects the garbage collector
+    # tracks: pipes that scroll off are kept in spare_pipes and respawned,
+    # and the pipe list is edited in place (see flappy_alloc.py).
+    def __init__(self, seed=None, fixed_point=False):
+        self.fixed_point = fixed_point
+        self.scale = FIXED_ONE if fixed_point else 1
+        self.ground_y = GROUND_Y * self.scale  # in game units, computed once
+        self.rng = random.Random(seed)
+        self.scheduler = Scheduler()
+        self.scheduler.handlers["spawn_pipe"] = self.spawn_pipe
+        self.course = CourseIndex(self.scale, to_fixed(PIPE_SPEED) if fixed_point else PIPE_SPEED)
+        self.pipes = []
+        self.spare_pipes = []
         self.best_score = 0
         self.background_color = LIGHT_BLUE  # Start with light blue
-        self.ground_color = random_ground_color()
+        self.ground_color = random_ground_color(self.rng)
         self.reset()
 
-    def reset(self):
-        self.bird = Bird()
-        self.pipes = []
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.bird = Bird(self.rng, self.fixed_point)
+        self.spare_pipes.extend(self.pipes)
+        self.pipes.clear()
+        self.course.clear()
         self.score = 0
-        self.last_pipe_time = pygame.time.get_ticks()
+        self.scheduler.clear()
+        self.scheduler.schedule(PIPE_FREQUENCY_FRAMES, "spawn_pipe", PIPE_FREQUENCY_FRAMES)
         self.game_over = False
+        # Always draw the colour so the RNG stream does not depend on earlier games
+        background_color = random_light_color(self.rng)
         if self.score > 0 or self.best_score > 0:  # Only change after first game
-            self.background_color = random_light_color()
-        self.ground_color = random_ground_color()
+            self.background_color = background_color
+        self.ground_color = random_ground_color(self.rng)
+
+    @property
+    def frame(self):
+        return self.scheduler.tick
+
+    def spawn_pipe(self):
+        if self.spare_pipes:
+            pipe = self.spare_pipes.pop()
+            pipe.respawn(SCREEN_WIDTH, self.rng)
+        else:
+            pipe = Pipe(SCREEN_WIDTH, self.rng, self.fixed_point)
+        self.pipes.append(pipe)
+        # The pipe has not moved yet, so it sits where it "was" after the last step
+        self.course.add(pipe.x, pipe.gap_y, self.frame - 1)
+
+    def step(self, flap=False):
+        """Advance one frame and return (state, score, done)."""
+        if flap and not self.game_over:
+            self.bird.jump()
+        self.update()
+        return self.get_state(), self.score, self.game_over
+
+    def get_state(self):
+        """Return (bird_y, bird_velocity, next_pipe_dx, next_gap_y) for the next unpassed pipe.
+
+        Values are in the game's units, so in fixed-point mode the state is a
+        tuple of ints that can be hashed and compared exactly.
+        """
+        bird = self.bird
+        scale = self.scale
+        for pipe in self.pipes:
+            if not pipe.passed:
+                return bird.y, bird.velocity, pipe.x - bird.x * scale, pipe.gap_y * scale
+        return bird.y, bird.velocity, (SCREEN_WIDTH - bird.x) * scale, (SCREEN_HEIGHT - GROUND_HEIGHT) // 2 * scale
 
     def update(self):
         if not self.game_over:
             self.bird.update()
 
-            # Create new pipes
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_pipe_time > PIPE_FREQUENCY:
-                self.pipes.append(Pipe(SCREEN_WIDTH))
-                self.last_pipe_time = current_time
+            # Run due events (new pipes)
+            self.scheduler.advance()
 
             # Update pipes
             for pipe in self.pipes:
                 pipe.update()
 
                 # Check if pipe is passed
-                if not pipe.passed and pipe.x + pipe.width < self.bird.x:
+                if not pipe.passed and pipe.x + pipe.width * self.scale < self.bird.x * self.scale:
                     pipe.passed = True
                     self.score += 1
 
-            # Remove offscreen pipes
-            self.pipes = [pipe for pipe in self.pipes if not pipe.is_offscreen()]
+            # Retire offscreen pipes; they all move together, so those are at the front
+            pipes = self.pipes
+            while pipes and pipes[0].is_offscreen():
+                self.spare_pipes.append(pipes.pop(0))
 
             # Check collisions
             self.check_collisions()
 
-    def check_collisions(self):
-        bird_rect = self.bird.get_rect()
+            if hooks.on_update is not None:
+                hooks.on_update(self)
+
+    def snapshot(self):
+        """Pack the full game state, RNG included, into a compact bytes blob."""
+        bird = self.bird
+        scheduler = self.scheduler
+        parts = [SNAPSHOT_HEADER.pack(
+            SNAPSHOT_VERSION, self.fixed_point, self.game_over, self.score, self.best_score,
+            BIRD_SHAPES.index(bird.shape), *bird.color, *self.background_color, *self.ground_color,
+            bird.y, bird.prev_y, bird.velocity,
+            scheduler.tick, scheduler.seq, len(self.pipes), len(scheduler.queue))]
+        for pipe in self.pipes:
+            parts.append(SNAPSHOT_PIPE.pack(pipe.x, pipe.prev_x, pipe.gap_y, pipe.passed, *pipe.color))
+        for due, seq, action, interval in scheduler.queue:
+            parts.append(SNAPSHOT_EVENT.pack(due, seq, SCHEDULER_ACTIONS.index(action), interval))
+        _, internal, gauss_next = self.rng.getstate()
+        parts.append(SNAPSHOT_RNG.pack(*internal, gauss_next is not None, gauss_next or 0.0))
+        return b"".join(parts)
+
+    def restore(self, data):
+        """Load a state produced by snapshot()."""
+        header = SNAPSHOT_HEADER.unpack_from(data)
+        if header[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {header[0]}")
+        if header[1] != self.fixed_point:
+            raise ValueError("Snapshot physics mode does not match this game")
+        # Positions are stored as doubles, which hold fixed-point integers exactly
+        number = int if self.fixed_point else float
+        bird = self.bird
+        scheduler = self.scheduler
+        self.game_over, self.score, self.best_score = header[2:5]
+        bird.shape = BIRD_SHAPES[header[5]]
+        bird.color = header[6:9]
+        self.background_color = header[9:12]
+        self.ground_color = header[12:15]
+        bird.y, bird.prev_y, bird.velocity = map(number, header[15:18])
+        scheduler.tick, scheduler.seq, pipe_count, event_count = header[18:22]
+
+        offset = SNAPSHOT_HEADER.size
+        pipes = []
+        for _ in range(pipe_count):
+            x, prev_x, gap_y, passed, r, g, b = SNAPSHOT_PIPE.unpack_from(data, offset)
+            pipes.append(Pipe.from_state(number(x), number(prev_x), gap_y, passed, (r, g, b), self.fixed_point))
+            offset += SNAPSHOT_PIPE.size
+        self.pipes = pipes
+        self.course.clear()
+        for pipe in pipes:
+            self.course.add(pipe.x, pipe.gap_y, self.frame)
+
+        queue = []
+        for _ in range(event_count):
+            due, seq, action, interval = SNAPSHOT_EVENT.unpack_from(data, offset)
+            queue.append((due, seq, SCHEDULER_ACTIONS[action], interval))
+            offset += SNAPSHOT_EVENT.size
+        scheduler.queue = queue  # stored in heap order already
+
+        rng_state = SNAPSHOT_RNG.unpack_from(data, offset)
+        self.rng.setstate((3, rng_state[:625], rng_state[626] if rng_state[625] else None))
 
+    def check_collisions(self):
         # Check ground collision
-        if self.bird.y + self.bird.size // 2 > SCREEN_HEIGHT - GROUND_HEIGHT:
+        if self.bird.y + self.bird.size // 2 * self.scale > self.ground_y:
             self.game_over = True
 
         # Check ceiling collision
-        if self.bird.y - self.bird.size // 2 < 0:
+        if self.bird.y - self.bird.size // 2 * self.scale < 0:
             self.game_over = True
 
-        # Check pipe collisions
-        for pipe in self.pipes:
-            pipe_rects = pipe.get_rects()
-            for rect in pipe_rects:
-                if bird_rect.colliderect(rect):
-                    self.game_over = True
+        # Check pipe collisions over the whole step, not just its end, so big
+        # steps cannot tunnel through a pipe lip (swept AABB).  Relative to a
+        # pipe the bird also moves right by the pipe's own step; while the two
+        # overlap horizontally (the window precomputed in the course index),
+        # the bird's swept vertical extent must stay inside the gap.
+        course = self.course
+        i = self.frame & course.mask
+        top = course.top[i]
+        if top > -math.inf:
+            bird = self.bird
+            size = bird.size
+            y = bird.prev_y / self.scale - size // 2
+            dy = (bird.y - bird.prev_y) / self.scale
+            # t0 <= t1, so dy alone orders the ends (no min()/max() calls,
+            # which allocate their argument tuple)
+            if dy < 0:
+                low = y + dy * course.t1[i]
+                high = y + dy * course.t0[i]
+            else:
+                low = y + dy * course.t0[i]
+                high = y + dy * course.t1[i]
+            if low < top and high > -size:
+                self.game_over = True
+            if low < GROUND_Y and high > course.bottom[i]:
+                self.game_over = True
+            course.release(i)
 
-        # Update best score
-        if self.game_over and self.score > self.best_score:
-            self.best_score = self.score
+        if self.game_over:
+            # Update best score
+            if self.score > self.best_score:
+                self.best_score = self.score
+            if hooks.on_collision is not None:
+                hooks.on_collision(self)
+
+    def draw(self, screen, alpha=1.0, zoom=1):
+        # zoom draws the whole frame scaled, straight onto screen (which can
+        # be a subsurface of a bigger window); coordinates below are logical
+        def at(x, y):
+            return (x, y) if zoom == 1 else (round(x * zoom), round(y * zoom))
+
+        # A finished game is frozen, so there is nothing to interpolate
+        if self.game_over:
+            alpha = 1.0
 
-    def draw(self):
-        # Draw background
-        screen.fill(self.background_color)
+        # Draw the static sky and ground layer, composed once per colour pair
+        screen.blit(sprites.background(self.background_color, self.ground_color,
+                                       at(SCREEN_WIDTH, SCREEN_HEIGHT), at(0, GROUND_HEIGHT)[1]), (0, 0))
 
-        # Draw pipes
+        # Draw pipes in one batched blit
+        blits = []
         for pipe in self.pipes:
-            pipe.draw()
-
-        # Draw ground
-        pygame.draw.rect(screen, self.ground_color, (0, SCREEN_HEIGHT - GROUND_HEIGHT, SCREEN_WIDTH, GROUND_HEIGHT))
+            blits.extend(pipe.get_blits(alpha, zoom))
+        screen.blits(blits, False)
 
         # Draw bird
-        self.bird.draw()
+        self.bird.draw(screen, alpha, zoom)
 
         # Draw score
-        score_text = font.render(f"Score: {self.score}", True, BLACK)
-        screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 10, 10))
+        score_label, best_score_label, game_over_label, restart_label, quit_label = hud_labels(zoom)
+        score_label.draw(screen, self.score, topright=at(SCREEN_WIDTH - 10, 10))
 
         # Draw game over screen
         if self.game_over:
-            game_over_text = font.render("Game Over", True, BLACK)
-            best_score_text = font.render(f"Best Score: {self.best_score}", True, BLACK)
-            restart_text = font.render("Press SPACE to restart", True, BLACK)
-            quit_text = font.render("Press Q or ESC to quit", True, BLACK)
+            game_over_text = game_over_label.render()
+            restart_text = restart_label.render()
+            quit_text = quit_label.render()
+
+            screen.blit(game_over_text, game_over_text.get_rect(midtop=at(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)))
+            best_score_label.draw(screen, self.best_score, midtop=at(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 40))
+            screen.blit(restart_text, restart_text.get_rect(midtop=at(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 80)))
+            screen.blit(quit_text, quit_text.get_rect(midtop=at(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 120)))
+
+        if hooks.on_draw is not None:
+            hooks.on_draw(self, screen)
+
+
+class Recording:
+    # Seed and flap frames of one game: enough to re-run it exactly.
+    # flaps holds game.frame at each SPACE press, i.e. the jump happens
+    # before simulation step frame + 1.  keyframes holds (frame, snapshot)
+    # pairs taken every keyframe_interval frames so long games can be seeked.
+    def __init__(self, seed, flaps=None, score=0, frames=0, finished=False,
+                 keyframe_interval=KEYFRAME_INTERVAL, keyframes=None):
+        self.seed = seed
+        self.flaps = array("I", flaps or ())
+        self.score = score
+        self.frames = frames
+        self.finished = finished
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = keyframes or []
+
+    def capture(self, game):
+        # Call after every simulation step of the recorded game
+        if game.frame % self.keyframe_interval == 0:
+            self.keyframes.append((game.frame, game.snapshot()))
+
+    def finish(self, game):
+        self.score = game.score
+        self.frames = game.frame
+        self.finished = game.game_over
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.score,
+                                       self.frames, self.finished, len(self.flaps)))
+            f.write(self.flaps.tobytes())
+            f.write(REPLAY_KEYFRAMES.pack(self.keyframe_interval, len(self.keyframes)))
+            offset = f.tell() + REPLAY_INDEX.size * len(self.keyframes)
+            for frame, blob in self.keyframes:
+                f.write(REPLAY_INDEX.pack(frame, offset, len(blob)))
+                offset += len(blob)
+            for _, blob in self.keyframes:
+                f.write(blob)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, score, frames, finished, flap_count = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version not in (1, REPLAY_VERSION):
+            raise ValueError(f"{path} is not a replay file")
+        offset = REPLAY_HEADER.size
+        flaps = array("I")
+        flaps.frombytes(data[offset:offset + 4 * flap_count])
+        recording = cls(seed, flaps, score, frames, finished)
+        if version >= 2:
+            offset += 4 * flap_count
+            recording.keyframe_interval, count = REPLAY_KEYFRAMES.unpack_from(data, offset)
+            offset += REPLAY_KEYFRAMES.size
+            for _ in range(count):
+                frame, start, size = REPLAY_INDEX.unpack_from(data, offset)
+                recording.keyframes.append((frame, data[start:start + size]))
+                offset += REPLAY_INDEX.size
+        return recording
+
+    def build_keyframes(self, interval=KEYFRAME_INTERVAL):
+        """Replay the game once to (re)create its keyframes, e.g. for version 1 files."""
+        self.keyframe_interval = interval
+        self.keyframes = []
+        game = Game()
+        game.reset(self.seed)
+        flap_index = 0
+        while game.frame < self.frames and not game.game_over:
+            flap_index = play(game, self.flaps, flap_index, game.frame + 1)
+            self.capture(game)
+
+
+def play(game, flaps, flap_index, until):
+    """Simulate game up to frame until, applying recorded flaps from flap_index on.
+
+    Returns the index of the next unused flap.
+    """
+    while game.frame < until and not game.game_over:
+        while flap_index < len(flaps) and flaps[flap_index] == game.frame:
+            game.bird.jump()
+            flap_index += 1
+        game.update()
+    return flap_index
+
+
+def replay(recording):
+    """Re-run a recording headlessly at full speed and return the resulting Game."""
+    game = Game()
+    game.reset(recording.seed)
+    play(game, recording.flaps, 0, recording.frames)
+    return game
 
-            screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3))
-            screen.blit(best_score_text,
-                        (SCREEN_WIDTH // 2 - best_score_text.get_width() // 2, SCREEN_HEIGHT // 3 + 40))
-            screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 3 + 80))
-            screen.blit(quit_text, (SCREEN_WIDTH // 2 - quit_text.get_width() // 2, SCREEN_HEIGHT // 3 + 120))
 
+def seek(recording, frame):
+    """Return a Game positioned at the given frame of a recording.
 
-def main():
+    Restores the nearest keyframe at or before frame, found by the frame
+    numbers stored with the keyframes, and simulates forward from there, so
+    with evenly spaced keyframes at most keyframe_interval frames are re-run.
+    """
+    frame = min(frame, recording.frames)
     game = Game()
+    game.reset(recording.seed)
+    keyframes = recording.keyframes
+    k = bisect.bisect_right([keyframe for keyframe, _ in keyframes], frame)
+    if k:
+        game.restore(keyframes[k - 1][1])
+    play(game, recording.flaps, bisect.bisect_left(recording.flaps, game.frame), frame)
+    return game
+
+
+def verify(recording):
+    """Return True if replaying the recording reproduces its score and final frame."""
+    game = replay(recording)
+    return (game.score == recording.score and game.frame == recording.frames
+            and game.game_over == recording.finished)
+
+
+def verify_files(paths):
+    failures = 0
+    start = time.perf_counter()
+    for path in paths:
+        recording = Recording.load(path)
+        ok = verify(recording)
+        failures += not ok
+        print(f"{'ok' if ok else 'MISMATCH'}  {path}  score={recording.score} frames={recording.frames}")
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths) - failures}/{len(paths)} replays matched in {elapsed:.2f}s")
+    return failures == 0
+
+
+def window_size(text):
+    """argparse type for WIDTHxHEIGHT."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"window size must be positive, got {text!r}")
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flappy Bird clone")
+    parser.add_argument("--seed", type=int, help="seed for the sequence of games (random if omitted)")
+    parser.add_argument("--record", metavar="DIR", help="save a replay file for every game into DIR")
+    parser.add_argument("--replay", metavar="FILE", nargs="+",
+                        help="re-run replay files headlessly and check score and death frame")
+    scaling = parser.add_mutually_exclusive_group()
+    scaling.add_argument("--window", metavar="WxH", type=window_size,
+                         help=f"window size; the game renders at {SCREEN_WIDTH}x{SCREEN_HEIGHT} "
+                              "and is scaled to fit, keeping its aspect ratio")
+    scaling.add_argument("--scaled", action="store_true",
+                         help="let SDL scale the frame to a resizable window (pygame.SCALED)")
+    parser.add_argument("--backend", choices=("surface", "texture", "software-texture"), default="surface",
+                        help="draw with surface blits (default) or with SDL renderer textures, "
+                             "on the GPU or on SDL's software renderer")
+    parser.add_argument("--max-fps", type=int, metavar="FPS",
+                        help="most frames rendered per second (default: the display's refresh rate; "
+                             "0 renders as fast as possible)")
+    add_pacing_arguments(parser)
+    add_alloc_arguments(parser)
+    args = parser.parse_args(argv)
+    vsync = args.pacing == "vsync"
+
+    if args.replay:
+        sys.exit(0 if verify_files(args.replay) else 1)
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+
+    # Create the screen.  The game always draws at the logical
+    # SCREEN_WIDTH x SCREEN_HEIGHT resolution, so simulation and drawing cost
+    # do not depend on the window; view is where that frame is scaled to.
+    view = None
+    present = pygame.display.flip
+    if args.backend != "surface":
+        # The renderer scales the logical frame to the window itself
+        from flappy_texture import TextureScreen
+        screen = TextureScreen.open("Flappy Bird Clone", (SCREEN_WIDTH, SCREEN_HEIGHT), args.window,
+                                    software=args.backend == "software-texture", vsync=vsync)
+        present = screen.present
+        vsync = screen.vsync
+    elif args.scaled:
+        screen, vsync = open_display((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync)
+    elif args.window and args.window != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        window, vsync = open_display(args.window, vsync=vsync)
+        scale = min(args.window[0] / SCREEN_WIDTH, args.window[1] / SCREEN_HEIGHT)
+        rect = pygame.Rect(0, 0, max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale)))
+        rect.center = window.get_rect().center
+        view = window.subsurface(rect)
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    else:
+        screen, vsync = open_display((SCREEN_WIDTH, SCREEN_HEIGHT), vsync=vsync)
+    pygame.display.set_caption("Flappy Bird Clone")
+
+    # Paces rendered frames and keeps frame-time statistics.  Frames beyond
+    # the display's refresh rate are never seen, so by default none are drawn
+    max_fps = refresh_rate() if args.max_fps is None else args.max_fps
+    pacer = FramePacer(max_fps, pacing_mode(args.pacing, vsync))
+
+    # Every game gets its own seed so it can be recorded and replayed on its own
+    seeds = random.Random(args.seed)
+    game = Game()
+
+    def new_game():
+        seed = seeds.getrandbits(63)
+        game.reset(seed)
+        return Recording(seed)
+
+    def save_recording():
+        recording.finish(game)
+        if args.record:
+            recording.save(os.path.join(args.record, f"{recording.seed}.fbr"))
+
+    recording = new_game()
+
+    # Fixed-timestep loop: the simulation advances in steps of 1/FPS of game time
+    # while frames are rendered at up to max_fps, interpolating between the
+    # last two steps.
+    sim_dt = 1.0 / FPS
+    time_scale = 1
+    accumulator = 0.0
+    previous = time.perf_counter()
+
+    # Freeze the startup objects out of the garbage collector's generations
+    # and, for --alloc-stats, track allocations and GC pauses per frame
+    alloc_tracker = prepare_loop(args.alloc_stats)
+    if alloc_tracker is not None:
+        hooks.add("on_frame_start", lambda game: alloc_tracker.begin_frame())
+        hooks.add("on_frame_end", lambda game: alloc_tracker.end_frame())
 
     # Main game loop
     running = True
+    focused = True
     while running:
-        for event in pygame.event.get():
+        # Idle: the game-over screen is static, so sleep until input arrives;
+        # in the background the game pauses, since the player cannot flap,
+        # and redraws at a low frame rate.  Any event ends the wait at once.
+        if game.game_over or not focused:
+            events = [pygame.event.wait(IDLE_TIMEOUT_MS if game.game_over else 1000 // UNFOCUSED_FPS)]
+            events.extend(pygame.event.get())
+            previous = time.perf_counter()  # no game time passes while idle
+            pacer.idle()
+        else:
+            events = pygame.event.get()
+
+        now = time.perf_counter()
+        accumulator += (now - previous) * time_scale
+        previous = now
+
+        if hooks.on_frame_start is not None:
+            hooks.on_frame_start(game)
+
+        for event in events:
+            if hooks.on_event is not None:
+                hooks.on_event(game, event)
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                focused = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     if game.game_over:
-                        game.reset()
-                    else:
+                        recording = new_game()
+                    elif focused:
+                        # No flaps while paused in the background
+                        recording.flaps.append(game.frame)
                         game.bird.jump()
+                elif event.key == pygame.K_f:
+                    # Toggle fast-forward; gameplay is unchanged, only more steps run per frame
+                    time_scale = 1 if time_scale != 1 else FAST_FORWARD_SCALE
                 elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                     running = False
 
-        game.update()
-        game.draw()
-
-        pygame.display.flip()
-        clock.tick(60)
+        steps = 0
+        max_steps = MAX_CATCHUP_STEPS * time_scale
+        while accumulator >= sim_dt and steps < max_steps:
+            game.update()
+            accumulator -= sim_dt
+            steps += 1
+            if not recording.finished:
+                recording.capture(game)
+                if game.game_over:
+                    save_recording()
+        # After a stall, drop the time we could not catch up instead of spiralling
+        if accumulator >= sim_dt:
+            accumulator = 0.0
+
+        game.draw(screen, accumulator / sim_dt)
+        if view is not None:
+            # Scale straight into the window's view; no surface is allocated per frame
+            pygame.transform.scale(screen, view.get_size(), view)
+
+        present()
+        if hooks.on_frame_end is not None:
+            hooks.on_frame_end(game)
+        pacer.tick()
+
+    if not recording.finished:
+        save_recording()
+    if args.frame_stats:
+        print(pacer.stats.summary())
+    if alloc_tracker is not None:
+        print(alloc_tracker.summary())
 
     pygame.quit()
     sys.exit()
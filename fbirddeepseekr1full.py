@@ -2,6 +2,8 @@ import pygame
 import random
 import sys
 
+from flappy_scheduler import Scheduler
+
 # Initialize Pygame
 pygame.init()
 
@@ -15,6 +17,7 @@ PIPE_SPEED = 4
 LAND_HEIGHT = 50
 GRAVITY = 0.5
 JUMP_STRENGTH = -12
+PIPE_INTERVAL_FRAMES = 90  # One pipe every 1.5 s of play at 60 FPS
 
 # Colors
 LIGHT_BLUE = (173, 216, 230)
@@ -79,10 +82,22 @@ def create_pipe():
     bottom_pipe = pygame.Rect(SCREEN_WIDTH, gap_y + GAP_HEIGHT, PIPE_WIDTH, SCREEN_HEIGHT - gap_y - GAP_HEIGHT)
     return {'top': top_pipe, 'bottom': bottom_pipe, 'color': pipe_color, 'scored': False}
 
+def spawn_pipe():
+    pipes.append(create_pipe())
+
+# Pipes spawn on simulation ticks, so exactly one appears per interval
+scheduler = Scheduler()
+scheduler.handlers["spawn_pipe"] = spawn_pipe
+
+def schedule_pipes():
+    scheduler.clear()
+    scheduler.schedule(PIPE_INTERVAL_FRAMES, "spawn_pipe", PIPE_INTERVAL_FRAMES)
+
 def reset_game():
     global bird, pipes, score, background_color, land_color, game_active
     bird = Bird()
     pipes = []
+    schedule_pipes()
     score = 0
     background_color = random_light_color()
     land_color = random.choice([DARK_BROWN, YELLOW])
@@ -97,6 +112,7 @@ score = 0
 best_score = 0
 game_active = False
 game_over = False
+schedule_pipes()
 
 # Main game loop
 while True:
@@ -129,8 +145,7 @@ while True:
             game_over = True
 
         # Pipe generation
-        if pygame.time.get_ticks() % 1500 < 30:
-            pipes.append(create_pipe())
+        scheduler.advance()
 
         # Pipe logic
         for pipe in pipes:
@@ -2,6 +2,8 @@ import pygame
 import random
 import sys
 
+from flappy_sprites import sprites
+
 # Initialize pygame
 pygame.init()
 
@@ -23,6 +25,7 @@ bird_x = 50
 bird_y = 300
 bird_shape = random.choice(BIRD_SHAPES)
 bird_color = random.choice(BIRD_COLORS)
+land_color = random.choice(LAND_COLORS)
 bird_velocity = 0
 gravity = 0.5
 jump_strength = -10
@@ -53,7 +56,8 @@ def draw_bird():
 def draw_pipes():
     for pipe in pipes:
         pygame.draw.rect(screen, pipe[2], (pipe[0], pipe[1], pipe_width, pipe[3]))
-        pygame.draw.rect(screen, pipe[2], (pipe[0], pipe[1] + pipe[3] + pipe_gap, pipe_width, SCREEN_HEIGHT - pipe[1] - pipe[3] - pipe_gap))
+        # The bottom pipe stops at the land, which is drawn before it
+        pygame.draw.rect(screen, pipe[2], (pipe[0], pipe[1] + pipe[3] + pipe_gap, pipe_width, SCREEN_HEIGHT - land_height - pipe[1] - pipe[3] - pipe_gap))
 
 def move_pipes():
     for pipe in pipes:
@@ -75,12 +79,13 @@ def check_collision():
     return False
 
 def reset_game():
-    global bird_y, bird_velocity, score, bird_shape, bird_color
+    global bird_y, bird_velocity, score, bird_shape, bird_color, land_color
     bird_y = 300
     bird_velocity = 0
     score = 0
     bird_shape = random.choice(BIRD_SHAPES)
     bird_color = random.choice(BIRD_COLORS)
+    land_color = random.choice(LAND_COLORS)
     pipes.clear()
     add_pipe()
 
@@ -120,11 +125,10 @@ while running:
             if score > best_score:
                 best_score = score
 
-    # Draw everything
-    screen.fill(BG_COLOR)
+    # Draw everything: the sky and land layer is composed once per land colour
+    screen.blit(sprites.background(BG_COLOR, land_color, (SCREEN_WIDTH, SCREEN_HEIGHT), land_height), (0, 0))
     draw_bird()
     draw_pipes()
-    pygame.draw.rect(screen, random.choice(LAND_COLORS), (0, SCREEN_HEIGHT - land_height, SCREEN_WIDTH, land_height))
     score_text = font.render(f'Score: {score}', True, (255, 255, 255))
     screen.blit(score_text, (SCREEN_WIDTH - 100, 20))
     if game_over:
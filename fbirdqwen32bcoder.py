@@ -2,6 +2,8 @@ import pygame
 import random
 import sys
 
+from flappy_text import NumberLabel, get_font
+
 pygame.init()
 
 screen_width = 400
@@ -29,9 +31,13 @@ pipe_gap_min = 150
 pipe_gap_max = 250
 best_score = 0
 
+# Fonts are built once; the score is composed from a digit atlas when it changes
+game_over_font = get_font(None, 48)
+score_label = NumberLabel(get_font(None, 36), "Score: ", (0, 0, 0))
+
 
 def draw_game_over(screen, current_score, best_score):
-    font = pygame.font.Font(None, 48)
+    font = game_over_font
     text = font.render(f"Game Over! Score: {current_score}", True, (255, 0, 0))
     screen.blit(text, (screen_width // 2 - text.get_width() // 2, screen_height // 2 - 50))
     best_text = font.render(f"Best: {best_score}", True, (255, 0, 0))
@@ -142,9 +148,7 @@ while running:
             ]
             pygame.draw.polygon(screen, bird_color, points)
 
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {current_score}", True, (0, 0, 0))
-        screen.blit(score_text, (screen_width - 150, 10))
+        score_label.draw(screen, current_score, topleft=(screen_width - 150, 10))
 
         pygame.display.update()
         clock.tick(60)
@@ -1,6 +1,8 @@
 import pygame
 import random
 
+from flappy_scheduler import Scheduler
+
 # Initialize Pygame
 pygame.init()
 
@@ -50,8 +52,7 @@ def draw_bird():
 
 # Pipes
 pipe_list = []
-SPAWNPIPE = pygame.USEREVENT
-pygame.time.set_timer(SPAWNPIPE, 1200)
+PIPE_INTERVAL_FRAMES = 36  # 1.2 seconds of play at 30 FPS
 pipe_height = [200, 300, 400]
 
 def create_pipe():
@@ -61,6 +62,14 @@ def create_pipe():
     top_pipe = pygame.Rect(SCREEN_WIDTH, 0, 70, SCREEN_HEIGHT - random_pipe_pos - 150)
     return bottom_pipe, top_pipe
 
+def spawn_pipe():
+    pipe_list.extend(create_pipe())
+
+# Pipes spawn on simulation ticks, so none pile up while the game is over
+scheduler = Scheduler()
+scheduler.handlers["spawn_pipe"] = spawn_pipe
+scheduler.schedule(PIPE_INTERVAL_FRAMES, "spawn_pipe", PIPE_INTERVAL_FRAMES)
+
 def move_pipes(pipes):
     for pipe in pipes:
         pipe.centerx -= 5
@@ -100,14 +109,14 @@ while True:
             if event.key == pygame.K_SPACE and not game_active:
                 game_active = True
                 pipe_list.clear()
+                scheduler.clear()
+                scheduler.schedule(PIPE_INTERVAL_FRAMES, "spawn_pipe", PIPE_INTERVAL_FRAMES)
                 bird_y_pos = SCREEN_HEIGHT // 2
                 bird_movement = 0
                 score = 0
             if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                 pygame.quit()
                 quit()
-        if event.type == SPAWNPIPE:
-            pipe_list.extend(create_pipe())
 
     screen.fill(background_color)
 
@@ -118,6 +127,7 @@ while True:
         draw_bird()
 
         # Pipes
+        scheduler.advance()
         pipe_list = move_pipes(pipe_list)
         draw_pipes(pipe_list)
 
@@ -2,6 +2,9 @@ import pygame
 import random
 import sys
 
+from flappy_scheduler import Scheduler
+from flappy_text import NumberLabel, get_font
+
 pygame.init()
 
 # Game constants
@@ -61,18 +64,41 @@ pipe_gap = 150
 pipe_width = 50
 pipes = []
 
-ADDPIPE = pygame.USEREVENT
-pygame.time.set_timer(ADDPIPE, 1200)  # Every 1.2 seconds
+PIPE_INTERVAL_FRAMES = 72  # Every 1.2 seconds of play at 60 FPS
 
 # Score
 score = 0
 best_score = 0
 font = pygame.font.Font(None, 48)  # Larger font
-score_font = pygame.font.Font(None, 36)
+score_font = get_font(None, 36)
+# The score and its shadow are composed from digit atlases when the score changes
+score_label = NumberLabel(score_font, "Score: ", (0, 0, 0))
+score_shadow_label = NumberLabel(score_font, "Score: ", (255, 255, 255))
 
 background_color = random.choice(light_colors)
 
 
+def add_pipe():
+    # Create new pipe
+    pipe_color = random.choice(pipe_colors)
+    max_pipe_height = screen_height - land_height - pipe_gap - 1
+    pipe_height = random.randint(150, max_pipe_height)
+    top_pipe = pygame.Rect(screen_width, 0, pipe_width, pipe_height)
+    bottom_pipe_height = (screen_height - land_height) - (pipe_height + pipe_gap)
+    bottom_pipe = pygame.Rect(screen_width, pipe_height + pipe_gap, pipe_width, bottom_pipe_height)
+    pipes.append({
+        'top_rect': top_pipe,
+        'bottom_rect': bottom_pipe,
+        'has_scored': False,
+        'color': pipe_color
+    })
+
+
+scheduler = Scheduler()
+scheduler.handlers["add_pipe"] = add_pipe
+scheduler.schedule(PIPE_INTERVAL_FRAMES, "add_pipe", PIPE_INTERVAL_FRAMES)
+
+
 def draw_bird(screen, x, y, shape, color):
     if shape == 'square':
         pygame.draw.rect(screen, color, (x, y, bird_size, bird_size))
@@ -98,20 +124,9 @@ while running:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     bird_vel += jump_strength
-            if event.type == ADDPIPE:
-                # Create new pipe
-                pipe_color = random.choice(pipe_colors)
-                max_pipe_height = screen_height - land_height - pipe_gap - 1
-                pipe_height = random.randint(150, max_pipe_height)
-                top_pipe = pygame.Rect(screen_width, 0, pipe_width, pipe_height)
-                bottom_pipe_height = (screen_height - land_height) - (pipe_height + pipe_gap)
-                bottom_pipe = pygame.Rect(screen_width, pipe_height + pipe_gap, pipe_width, bottom_pipe_height)
-                pipes.append({
-                    'top_rect': top_pipe,
-                    'bottom_rect': bottom_pipe,
-                    'has_scored': False,
-                    'color': pipe_color
-                })
+
+        # Spawn pipes on simulation ticks rather than a wall-clock timer
+        scheduler.advance()
 
         # Update bird's physics
         bird_vel += gravity
@@ -154,10 +169,8 @@ while running:
         pygame.draw.rect(screen, land_color, land_rect)
 
         # Improved score display with shadow effect
-        score_text = score_font.render(f"Score: {score}", True, (0, 0, 0))
-        screen.blit(score_text, (screen_width - 150, 10))
-        score_text_shadow = score_font.render(f"Score: {score}", True, (255, 255, 255))
-        screen.blit(score_text_shadow, (screen_width - 153, 13))
+        score_label.draw(screen, score, topleft=(screen_width - 150, 10))
+        score_shadow_label.draw(screen, score, topleft=(screen_width - 153, 13))
 
         pygame.display.flip()
     else:
@@ -199,6 +212,8 @@ while running:
                     bird_vel = 0
                     score = 0
                     pipes = []
+                    scheduler.clear()
+                    scheduler.schedule(PIPE_INTERVAL_FRAMES, "add_pipe", PIPE_INTERVAL_FRAMES)
                     background_color = random.choice(light_colors)
                     bird_shape = random.choice(['square', 'circle', 'triangle'])
                     bird_color = random.choice(dark_colors)
@@ -0,0 +1,202 @@
+"""Per-frame allocation and garbage-collection tracking.
+
+An AllocationTracker brackets each frame with begin_frame() and end_frame()
+and records, per frame:
+
+- bytes: how far traced memory rose above its level at the start of the
+  frame (tracemalloc's peak), so 0 means the frame allocated nothing it had
+  not freed memory for first;
+- blocks: the change in live memory blocks (sys.getallocatedblocks()), which
+  stays positive when a frame keeps what it allocated;
+- tracked: the change in objects the garbage collector tracks (lists,
+  instances, ...; not ints, floats or strings).  A collection runs once
+  enough of them pile up, so a loop that keeps none never triggers one;
+- collections: garbage collector runs during the frame and how long they
+  paused the game, from gc.callbacks.
+
+Game loops get the shared --alloc-stats option from add_alloc_arguments()
+and call prepare_loop() right before their first frame.
+
+tracemalloc slows every allocation down, so frame times taken at the same
+time are not representative.  Running this module checks that the
+fbirdclaude37extended.py simulation allocates nothing once it is running:
+
+    python flappy_alloc.py --frames 20000
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections import deque
+from time import perf_counter_ns
+
+ALLOC_WINDOW = 600  # frames kept for the rolling figures
+TRACE_DEPTH = 1  # stack frames tracemalloc keeps per allocation; raise for deeper top_sites()
+
+
+class AllocationTracker:
+    def __init__(self, window=ALLOC_WINDOW, trace_depth=TRACE_DEPTH):
+        self.trace_depth = trace_depth
+        self.bytes = deque(maxlen=window)
+        self.pauses = deque(maxlen=window)
+        self.frames = 0
+        self.allocating_frames = 0
+        self.total_bytes = 0
+        self.total_blocks = 0
+        self.total_tracked = 0
+        self.max_bytes = 0
+        self.collections = [0, 0, 0]  # by generation
+        self.total_pause = 0  # nanoseconds
+        self.max_pause = 0
+        self.gc_frames = 0
+        self.started_tracing = False
+        self.baseline = None
+        self._gc_start = 0
+        self._frame_pause = 0
+        self._frame_collections = 0
+        self._frame_memory = 0
+        self._frame_blocks = 0
+        self._frame_tracked = 0
+        self._peak = 0
+
+    def start(self):
+        """Start tracemalloc (unless it already runs) and listen to the garbage collector."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_depth)
+            self.started_tracing = True
+        gc.callbacks.append(self._on_gc)
+        self.baseline = tracemalloc.take_snapshot()
+        self._frame_blocks = sys.getallocatedblocks()
+        self._frame_tracked = gc.get_count()[0]
+        self._frame_memory, self._peak = tracemalloc.get_traced_memory()
+
+    def stop(self):
+        gc.callbacks.remove(self._on_gc)
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = perf_counter_ns()
+        else:
+            pause = perf_counter_ns() - self._gc_start
+            self._frame_pause += pause
+            self._frame_collections += 1
+            self.collections[info["generation"]] += 1
+
+    def begin_frame(self):
+        # Collections between frames (e.g. in the event wait) count towards
+        # the next frame.  The counters are read into attributes that already
+        # hold ints, so reading them allocates nothing net.
+        self._frame_blocks = sys.getallocatedblocks()
+        self._frame_tracked = gc.get_count()[0]
+        self._frame_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end_frame(self):
+        self._peak = tracemalloc.get_traced_memory()[1]
+        blocks = sys.getallocatedblocks() - self._frame_blocks
+        tracked = gc.get_count()[0] - self._frame_tracked
+        allocated = self._peak - self._frame_memory
+        pause = self._frame_pause
+        self.bytes.append(allocated)
+        self.pauses.append(pause)
+        self.frames += 1
+        if allocated:
+            self.allocating_frames += 1
+        self.total_bytes += allocated
+        self.total_blocks += blocks
+        self.max_bytes = max(self.max_bytes, allocated)
+        if self._frame_collections:
+            # A collection resets the count, so the frame's own change is unknown
+            self.gc_frames += 1
+            self.total_pause += pause
+            self.max_pause = max(self.max_pause, pause)
+        else:
+            self.total_tracked += tracked
+        self._frame_pause = 0
+        self._frame_collections = 0
+
+    def top_sites(self, limit=10):
+        """Source lines whose live memory grew most since start(), as tracemalloc StatisticDiffs."""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        return [stat for stat in snapshot.compare_to(self.baseline, "lineno") if stat.size_diff > 0][:limit]
+
+    def summary(self):
+        frames = self.frames or 1
+        gen0, gen1, gen2 = self.collections
+        recent = max(self.bytes, default=0)
+        return (f"{self.frames} frames: {self.allocating_frames} allocated "
+                f"({self.allocating_frames / frames:.0%}), {self.total_bytes / frames:.0f} B/frame on average, "
+                f"max {self.max_bytes} B (last {len(self.bytes)} frames: {recent} B), "
+                f"{self.total_blocks:+d} live blocks, {self.total_tracked:+d} gc-tracked objects; "
+                f"gc: {gen0}/{gen1}/{gen2} collections (gen 0/1/2) in {self.gc_frames} frames, "
+                f"{self.total_pause / 1e6:.2f} ms total, max pause {self.max_pause / 1e6:.3f} ms")
+
+
+def add_alloc_arguments(parser):
+    """Add the --alloc-stats option shared by the game loops to an ArgumentParser."""
+    parser.add_argument("--alloc-stats", action="store_true",
+                        help="track allocations and garbage-collector pauses per frame (slow) "
+                             "and print them on exit")
+
+
+def prepare_loop(alloc_stats=False):
+    """Get the garbage collector ready for a game loop; call right before its first frame.
+
+    Everything created so far lives for the whole session, so it is moved out
+    of the collector's generations and collections only scan new objects.
+    Returns a started AllocationTracker if alloc_stats is set, else None.
+    """
+    gc.collect()
+    gc.freeze()
+    if not alloc_stats:
+        return None
+    tracker = AllocationTracker()
+    tracker.start()
+    return tracker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure allocations per simulation step of the claude37 game")
+    parser.add_argument("--frames", type=int, default=20000, help="steps to measure (default 20000)")
+    parser.add_argument("--warmup", type=int, default=600, help="steps run before measuring (default 600)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixed-point", action="store_true", help="use fixed-point physics")
+    args = parser.parse_args(argv)
+
+    from fbirdclaude37extended import Game
+
+    # A gap-seeking bot keeps the bird alive for long stretches; restarts
+    # happen between measured frames, since a new game allocates by design
+    game = Game(args.seed, fixed_point=args.fixed_point)
+    tracker = AllocationTracker()
+    state = game.get_state()
+    restarts = 0
+    for frame in range(args.warmup + args.frames):
+        if frame == args.warmup:
+            tracker.start()
+        flap = state[0] > state[3] and state[1] > 0  # below the gap and falling
+        measure = frame >= args.warmup
+        if measure:
+            tracker.begin_frame()
+        state, _, done = game.step(flap)
+        if measure:
+            tracker.end_frame()
+        if done:
+            restarts += 1
+            game.reset()
+            state = game.get_state()
+    print(f"{restarts} restarts")
+    print(tracker.summary())
+    for stat in tracker.top_sites(5):
+        print(f"  {stat}")
+    tracker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Vectorised batch simulator for the fbirdclaude37extended.py game.
+
+N birds are kept as NumPy arrays (y, velocity, alive, score) and fly through
+one shared pipe course, so each frame is a handful of array operations no
+matter how many birds there are.  The rules are the same as Game.update():
+for a given pipe course and flap sequence every bird ends up exactly where a
+single Game would.  With fixed_point=True the arrays are int64 in the same
+1/FIXED_ONE px units as Game(fixed_point=True).
+"""
+import math
+import random
+
+import numpy as np
+
+from fbirdclaude37extended import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, JUMP_STRENGTH, PIPE_SPEED,
+    PIPE_FREQUENCY_FRAMES, GROUND_HEIGHT, BIRD_SIZE, FIXED_ONE,
+    CourseIndex, Pipe, to_fixed,
+)
+from flappy_scheduler import Scheduler
+
+BIRD_X = SCREEN_WIDTH // 4
+GROUND_Y = SCREEN_HEIGHT - GROUND_HEIGHT
+HALF = BIRD_SIZE // 2
+
+
+class BatchGame:
+    def __init__(self, n, seed=None, fixed_point=False):
+        self.n = n
+        self.fixed_point = fixed_point
+        self.scale = FIXED_ONE if fixed_point else 1
+        dtype = np.int64 if fixed_point else np.float64
+        self.gravity = to_fixed(GRAVITY) if fixed_point else GRAVITY
+        self.jump_strength = to_fixed(JUMP_STRENGTH) if fixed_point else JUMP_STRENGTH
+        self.rng = random.Random(seed)
+        self.scheduler = Scheduler()
+        self.scheduler.handlers["spawn_pipe"] = self._spawn_pipe
+        self.course = CourseIndex(self.scale, to_fixed(PIPE_SPEED) if fixed_point else PIPE_SPEED)
+        self.y = np.empty(n, dtype=dtype)
+        self.prev_y = np.empty(n, dtype=dtype)
+        self.velocity = np.empty(n, dtype=dtype)
+        self.alive = np.empty(n, dtype=bool)
+        self.score = np.empty(n, dtype=np.int64)
+        self.death_frame = np.empty(n, dtype=np.int64)
+        # Scratch buffers reused every frame
+        self._state = np.empty((n, 4), dtype=dtype)
+        self._hit = np.empty(n, dtype=bool)
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.y.fill(SCREEN_HEIGHT // 2 * self.scale)
+        self.prev_y.fill(SCREEN_HEIGHT // 2 * self.scale)
+        self.velocity.fill(0)
+        self.alive.fill(True)
+        self.score.fill(0)
+        self.death_frame.fill(-1)
+        self.pipes = []
+        self.course.clear()
+        self.scheduler.clear()
+        self.scheduler.schedule(PIPE_FREQUENCY_FRAMES, "spawn_pipe", PIPE_FREQUENCY_FRAMES)
+
+    @property
+    def frame(self):
+        return self.scheduler.tick
+
+    @property
+    def done(self):
+        return not self.alive.any()
+
+    def step(self, flaps):
+        """Advance every bird one frame and return (state, score, alive).
+
+        flaps is a boolean array (or a scalar) saying which birds jump this
+        frame.  Dead birds are frozen where they died.
+        """
+        alive = self.alive
+        velocity = self.velocity
+
+        # Flap: same rule as Bird.jump(), only for living birds
+        flap = np.logical_and(flaps, alive)
+        np.add(velocity, self.jump_strength, out=velocity, where=flap)
+        np.maximum(velocity, self.jump_strength * 2, out=velocity, where=flap)
+
+        # Gravity
+        np.copyto(self.prev_y, self.y)
+        np.add(velocity, self.gravity, out=velocity, where=alive)
+        np.add(self.y, velocity, out=self.y, where=alive)
+
+        self.scheduler.advance()
+        self._update_pipes()
+        self._check_collisions()
+        return self.get_state(), self.score, self.alive
+
+    def _spawn_pipe(self):
+        pipe = Pipe(SCREEN_WIDTH, self.rng, self.fixed_point)
+        self.pipes.append(pipe)
+        self.course.add(pipe.x, pipe.gap_y, self.frame - 1)
+
+    def _update_pipes(self):
+        scale = self.scale
+        for pipe in self.pipes:
+            pipe.update()
+            # Every bird shares x, so a pipe is passed by all living birds at once
+            if not pipe.passed and pipe.x + pipe.width * scale < BIRD_X * scale:
+                pipe.passed = True
+                self.score += self.alive
+
+        if self.pipes and self.pipes[0].is_offscreen():
+            self.pipes = [pipe for pipe in self.pipes if not pipe.is_offscreen()]
+
+    def _check_collisions(self):
+        y = self.y
+        hit = self._hit
+        scale = self.scale
+        half = HALF * scale
+
+        # Ground and ceiling
+        np.greater(y + half, GROUND_Y * scale, out=hit)
+        hit |= y - half < 0
+
+        # Pipes: every bird shares x, so the course index gives one sweep
+        # window and gap for this step (see Game.check_collisions) and only
+        # the vertical extent swept during that window is tested per bird.
+        course = self.course
+        i = self.frame & course.mask
+        top = course.top[i]
+        if top > -math.inf:
+            start = self.prev_y / scale - HALF
+            dy = (y - self.prev_y) / scale
+            y0 = start + dy * course.t0[i]
+            y1 = start + dy * course.t1[i]
+            low = np.minimum(y0, y1)
+            high = np.maximum(y0, y1)
+            hit |= (low < top) & (high > -BIRD_SIZE)
+            hit |= (low < GROUND_Y) & (high > course.bottom[i])
+            course.release(i)
+
+        hit &= self.alive
+        if hit.any():
+            self.alive &= ~hit
+            self.death_frame[hit] = self.frame
+
+    def get_state(self):
+        """Return an (n, 4) array of (y, velocity, next_pipe_dx, next_gap_y) rows in game units."""
+        state = self._state
+        scale = self.scale
+        state[:, 0] = self.y
+        state[:, 1] = self.velocity
+        for pipe in self.pipes:
+            if not pipe.passed:
+                state[:, 2] = pipe.x - BIRD_X * scale
+                state[:, 3] = pipe.gap_y * scale
+                break
+        else:
+            state[:, 2] = (SCREEN_WIDTH - BIRD_X) * scale
+            state[:, 3] = GROUND_Y // 2 * scale
+        return state
+
+    def run(self, policy, max_frames):
+        """Drive every bird with policy(state) -> flaps until all die or max_frames pass."""
+        state = self.get_state()
+        for _ in range(max_frames):
+            if self.done:
+                break
+            state, _, _ = self.step(policy(state))
+        return self.score
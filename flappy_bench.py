@@ -0,0 +1,436 @@
+"""Headless benchmarks for every fbird*.py game, with saved baselines.
+
+    python flappy_bench.py                       # all games and microbenchmarks
+    python flappy_bench.py fbirdqwen72b.py --frames 5000
+    python flappy_bench.py --save                # store the results as the baseline
+    python flappy_bench.py --compare             # fail if anything regressed
+
+Each game runs unmodified through flappy_runner in its own process (dummy
+video driver, SPACE every --flap-every frames, uncapped clock with each frame
+worth 1/60 s of game time), so peak RSS is the game's own.  Per game it reports frames per second, the mean and p95
+frame time, how that time splits into update and draw, and peak RSS.  The
+split comes from stack samples: a sample counts as draw when the game is in
+a function whose name contains "draw" or on a line that blits, fills, draws,
+renders text or flips the display, and as update otherwise (events included).
+
+Microbenchmarks time the simulation step, collision, text and draw paths of
+the claude37 and o1pro games in isolation, in microseconds per call.  Each
+one starts its timing runs from the same state, and the runs of all of them
+are interleaved so a busy spell of the machine does not land on just one.
+
+--save writes everything to the baseline file; --compare checks a run
+against it and exits with status 1 if a game's frames per second or peak
+RSS got worse by more than --threshold, or a microbenchmark by more than
+--micro-threshold; games and microbenchmarks that come out slower are
+measured again first, and only a slowdown that persists counts.  Numbers depend on the
+machine, so keep baselines per machine; each game's fastest of --repeat runs
+counts, which keeps one-off stalls out of the comparison.
+"""
+import argparse
+import glob
+import itertools
+import json
+import linecache
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "benchmarks", "baseline.json")
+RESULT_MARKER = "BENCH_RESULT "
+WARMUP_FRAMES = 60  # frames run before measuring, so startup and caches are out of the numbers
+SAMPLE_INTERVAL = 0.0005  # seconds between stack samples
+DRAW_LINE = re.compile(r"\.(blit|blits|fblits|fill)\(|pygame\.draw\.|\.render\(|display\.(flip|update)\(")
+MICRO_ROUNDS = 20  # timing runs per microbenchmark, interleaved; the fastest counts
+MICRO_MIN_TIME = 0.03  # seconds per timing run
+RETRIES = 2  # extra measurements of a slower game or microbenchmark before --compare counts it
+SCORE_FRAMES = 90  # calls per score change in the text microbenchmarks
+
+# (metric, direction): direction 1 means higher is better.  Only these are
+# checked against --threshold; the update/draw split and p95 are sampled or
+# tail measures and too noisy to gate on.  Microbenchmarks have their own,
+# looser --micro-threshold: timings of a microsecond or less vary by tens of
+# percent between runs on a busy machine.
+GAME_METRICS = (("fps", 1), ("rss_mb", -1))
+
+
+def find_games():
+    return sorted(os.path.basename(path) for path in glob.glob(os.path.join(HERE, "fbird*.py")))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where the OS cannot tell."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ------------------------------------------------------------ child process
+
+def run_game(path, frames, flap_every):
+    # Imported here so the parent process stays free of pygame
+    from flappy_pacing import FrameStats
+    from flappy_profile import SamplingProfiler
+    from flappy_runner import run_script
+
+    class LineSampler(SamplingProfiler):
+        # Keeps the line each frame was on, so samples can be told apart by
+        # what the game was doing; classifying them reads source files, which
+        # is left until the run is over rather than done in the signal handler
+        def sample(self, frame):
+            root_file = self.root_file
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code, frame.f_lineno or 0))  # f_lineno is None while a frame starts up
+                if code.co_filename == root_file and code.co_name == "<module>":
+                    break
+                frame = frame.f_back
+            if frame is not None:  # not inside the game (startup or pygame.quit())
+                self.counts[tuple(stack)] += 1
+                self.samples += 1
+
+        def draw_samples(self):
+            kinds = {}
+            draw = 0
+            for stack, count in self.counts.items():
+                for key in stack:
+                    is_draw = kinds.get(key)
+                    if is_draw is None:
+                        code, lineno = key
+                        line = linecache.getline(code.co_filename, lineno)
+                        is_draw = kinds[key] = "draw" in code.co_name or DRAW_LINE.search(line) is not None
+                    if is_draw:
+                        draw += count
+                        break
+            return draw
+
+    stats = FrameStats(0, window=frames)
+    sampler = LineSampler(SAMPLE_INTERVAL, os.path.abspath(path))
+    last = None
+
+    def on_frame(count):
+        nonlocal last
+        now = time.perf_counter()
+        if count == WARMUP_FRAMES:
+            sampler.start()
+        elif count > WARMUP_FRAMES:
+            stats.add(now - last)
+        last = now
+
+    drawn = run_script(path, frames + WARMUP_FRAMES, flap_every=flap_every, on_frame=on_frame)
+    if drawn >= WARMUP_FRAMES:
+        sampler.stop()
+
+    measured = stats.frames
+    total = sum(stats.times)
+    mean = total / measured if measured else 0.0
+    samples = sampler.samples
+    draw_share = sampler.draw_samples() / samples if samples else 0.0
+    p95, = stats.percentiles(95)
+    return {
+        "frames": measured,
+        "fps": measured / total if total else 0.0,
+        "frame_ms": mean * 1000,
+        "p95_ms": p95 * 1000,
+        "update_ms": mean * (1 - draw_share) * 1000,
+        "draw_ms": mean * draw_share * 1000,
+        "samples": samples,
+        "rss_mb": peak_rss_mb(),
+    }
+
+
+# ------------------------------------------------------------ microbenchmarks
+
+def micro_benchmarks():
+    """Return {name: (function, setup)} for the update, collision, text and draw microbenchmarks.
+
+    setup, if not None, runs before every timing run, so each run times the
+    same work.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    import fbirdclaude37extended as claude37
+    import fbirdcgpto1pro as o1pro
+    from flappy_text import NumberLabel, get_font
+
+    screen = pygame.display.set_mode((o1pro.SCREEN_WIDTH, o1pro.SCREEN_HEIGHT))
+    frame = pygame.Surface((claude37.SCREEN_WIDTH, claude37.SCREEN_HEIGHT)).convert()
+    benchmarks = {}
+
+    # A claude37 game in mid-flight, kept alive by a gap-seeking bot.  Its
+    # collision test releases the course index as it goes, so it is timed
+    # as part of a whole step.  Every timing run starts from the same
+    # snapshot, so runs step through the same frames.
+    game = claude37.Game(0)
+    state = game.get_state()
+
+    def step():
+        nonlocal state
+        state, _, done = game.step(state[0] > state[3] and state[1] > 0)
+        if done:
+            game.reset()
+            state = game.get_state()
+
+    for _ in range(600):
+        step()
+    start = game.snapshot()
+
+    def restart_game():
+        nonlocal state
+        game.restore(start)
+        state = game.get_state()
+
+    benchmarks["update/claude37-step"] = (step, restart_game)
+
+    # o1pro's swept test with the bird rising into a pipe's upper lip
+    bird = o1pro.Bird(o1pro.SCREEN_WIDTH // 4, 230)
+    bird.prev_y = 234
+    pipe = o1pro.Pipe(bird.x - 20, 300, o1pro.PIPE_GAP)
+    pipe.update()
+    benchmarks["collision/o1pro-swept"] = (lambda: pipe.check_collision(bird), None)
+
+    # What most of the games do: build two Rects and test them every frame
+    Rect = pygame.Rect
+    benchmarks["collision/rect"] = (lambda: Rect(100, 296, 30, 30).colliderect(Rect(110, 0, 50, 225)), None)
+
+    # The same HUD score both ways, rendered and blitted every frame as most
+    # games do it, or drawn through the cached NumberLabel; the score goes
+    # up every SCORE_FRAMES calls like it does in play
+    font = get_font(None, claude37.FONT_SIZE)
+    label = NumberLabel(font, "Score: ", claude37.BLACK)
+    calls = None
+
+    def restart_score():
+        nonlocal calls
+        calls = itertools.count()
+
+    def render_and_blit():
+        frame.blit(font.render(f"Score: {next(calls) // SCORE_FRAMES}", True, claude37.BLACK), (10, 10))
+
+    benchmarks["text/render-and-blit"] = (render_and_blit, restart_score)
+    benchmarks["text/number-label"] = (lambda: label.draw(frame, next(calls) // SCORE_FRAMES, topleft=(10, 10)),
+                                       restart_score)
+
+    benchmarks["draw/claude37-frame"] = (lambda: game.draw(frame), restart_game)
+    benchmarks["draw/claude37-zoom-0.5"] = (lambda: game.draw(frame, zoom=0.5), restart_game)
+
+    pipes = [o1pro.Pipe(x, 300, o1pro.PIPE_GAP) for x in (60, 360)]
+    background = o1pro.sprites.background((200, 220, 240), (101, 67, 33),
+                                          (o1pro.SCREEN_WIDTH, o1pro.SCREEN_HEIGHT), o1pro.GROUND_HEIGHT)
+
+    def o1pro_frame():
+        screen.blit(background, (0, 0))
+        pipe_blits = []
+        for pipe in pipes:
+            pipe_blits.extend(pipe.get_blits())
+        screen.blits(pipe_blits, False)
+        bird.draw(screen)
+        o1pro.SCORE_LABEL.draw(screen, 12, topright=(o1pro.SCREEN_WIDTH - 10, 10))
+
+    benchmarks["draw/o1pro-frame"] = (o1pro_frame, None)
+    return benchmarks
+
+
+def time_benchmarks(benchmarks, rounds=MICRO_ROUNDS):
+    """Best time of one call in microseconds for each of benchmarks ({name: (function, setup)}).
+
+    Timing runs are interleaved, one per benchmark per round, so a slow spell
+    of the machine costs every benchmark one run instead of one benchmark
+    all of them.
+    """
+    timers = []
+    for name, (function, setup) in benchmarks.items():
+        timer = timeit.Timer(function, setup or "pass")
+        number = 1
+        while timer.timeit(number) < MICRO_MIN_TIME:
+            number *= 2
+        timers.append((name, timer, number))
+    best = dict.fromkeys(benchmarks, math.inf)
+    for _ in range(rounds):
+        for name, timer, number in timers:
+            best[name] = min(best[name], timer.timeit(number) / number * 1e6)
+    return best
+
+
+def retime_slower(micro, baseline, benchmarks, threshold):
+    """Measure microbenchmarks slower than baseline by more than threshold again, keeping the best time.
+
+    A real regression survives being measured again; a busy spell of the
+    machine usually does not.
+    """
+    for _ in range(RETRIES):
+        slower = {name: benchmarks[name] for name, usec in micro.items()
+                  if baseline.get(name) and usec > baseline[name] * (1 + threshold)}
+        if not slower:
+            break
+        print(f"measuring again: {', '.join(slower)}", file=sys.stderr)
+        for name, usec in time_benchmarks(slower).items():
+            micro[name] = min(micro[name], usec)
+
+
+# ------------------------------------------------------------ parent process
+
+def bench_game(game, frames, flap_every, repeat):
+    """Run game in fresh processes repeat times and keep the fastest run, with the lowest peak RSS of any."""
+    best = None
+    rss = []
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    for _ in range(repeat):
+        command = [sys.executable, os.path.abspath(__file__), "--child", game,
+                   "--frames", str(frames), "--flap-every", str(flap_every)]
+        process = subprocess.run(command, cwd=HERE, env=env, capture_output=True, text=True)
+        lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+        if not lines:
+            error = (process.stderr.strip().splitlines() or ["no result"])[-1]
+            return {"error": error}
+        result = json.loads(lines[-1][len(RESULT_MARKER):])
+        if result["rss_mb"] is not None:
+            rss.append(result["rss_mb"])
+        if best is None or result["fps"] > best["fps"]:
+            best = result
+    best["rss_mb"] = min(rss, default=None)
+    return best
+
+
+def rerun_slower(games, baseline, paths, threshold, frames, flap_every, repeat):
+    """Run games whose fps fell below baseline by more than threshold again, keeping the fastest run."""
+    for _ in range(RETRIES):
+        slower = [name for name, result in games.items()
+                  if "fps" in result and baseline.get(name, {}).get("fps")
+                  and result["fps"] < baseline[name]["fps"] * (1 - threshold)]
+        if not slower:
+            break
+        print(f"running again: {', '.join(slower)}", file=sys.stderr)
+        for name in slower:
+            result = bench_game(paths[name], frames, flap_every, repeat)
+            if "fps" in result and result["fps"] > games[name]["fps"]:
+                result["requested"] = frames
+                if games[name]["rss_mb"] is not None and result["rss_mb"] is not None:
+                    result["rss_mb"] = min(result["rss_mb"], games[name]["rss_mb"])
+                games[name] = result
+
+
+def print_games(games):
+    print(f"{'game':28} {'fps':>9} {'frame ms':>9} {'p95 ms':>8} {'update ms':>10} {'draw ms':>8} {'peak RSS MB':>12}")
+    for name, result in games.items():
+        if "error" in result:
+            print(f"{name:28} failed: {result['error']}")
+            continue
+        rss = f"{result['rss_mb']:.1f}" if result["rss_mb"] is not None else "-"
+        short = " (ended early)" if result["frames"] < result["requested"] else ""
+        print(f"{name:28} {result['fps']:9.0f} {result['frame_ms']:9.3f} {result['p95_ms']:8.3f} "
+              f"{result['update_ms']:10.3f} {result['draw_ms']:8.3f} {rss:>12}{short}")
+
+
+def print_micro(micro):
+    print(f"{'microbenchmark':28} {'usec':>9}")
+    for name, usec in micro.items():
+        print(f"{name:28} {usec:9.2f}")
+
+
+def compare(results, baseline, threshold, micro_threshold):
+    """Print changes against baseline and return the regressions beyond the thresholds."""
+    regressions = []
+    checks = []
+    for name, result in results["games"].items():
+        old = baseline.get("games", {}).get(name)
+        if old is None or "error" in result or "error" in old:
+            continue
+        for metric, direction in GAME_METRICS:
+            if result.get(metric) is not None and old.get(metric):
+                checks.append((f"{name} {metric}", old[metric], result[metric], direction, threshold))
+    for name, usec in results["micro"].items():
+        old = baseline.get("micro", {}).get(name)
+        if old:
+            checks.append((f"{name} usec", old, usec, -1, micro_threshold))
+
+    print(f"{'compared with baseline':40} {'old':>10} {'new':>10} {'change':>8}")
+    for label, old, new, direction, limit in checks:
+        change = (new - old) / old
+        worse = -change * direction > limit
+        flag = "  REGRESSED" if worse else ""
+        print(f"{label:40} {old:10.2f} {new:10.2f} {change:+8.1%}{flag}")
+        if worse:
+            regressions.append(label)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the games headlessly")
+    parser.add_argument("games", nargs="*", help="game files (default: every fbird*.py)")
+    parser.add_argument("--frames", type=int, default=2000, help="measured frames per run (default 2000)")
+    parser.add_argument("--flap-every", type=int, default=10, help="press SPACE every N frames")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per game; the fastest counts (default 3)")
+    parser.add_argument("--micro", nargs="*", metavar="PREFIX",
+                        help="only run microbenchmarks, optionally those starting with PREFIX")
+    parser.add_argument("--no-micro", action="store_true", help="skip the microbenchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (default benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change in a game's fps or RSS that counts as a regression (default 0.10)")
+    parser.add_argument("--micro-threshold", type=float, default=0.25,
+                        help="relative slowdown of a microbenchmark that counts as a regression (default 0.25)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    parser.add_argument("--child", metavar="GAME", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_game(args.child, args.frames, args.flap_every)
+        print(RESULT_MARKER + json.dumps(result), flush=True)
+        return
+
+    results = {"games": {}, "micro": {}}
+    benchmarks = {}
+    paths = {}
+    if args.micro is None:
+        for game in args.games or find_games():
+            name = os.path.basename(game)
+            paths[name] = game
+            print(f"running {name}...", file=sys.stderr)
+            result = bench_game(game, args.frames, args.flap_every, args.repeat)
+            result["requested"] = args.frames
+            results["games"][name] = result
+        print_games(results["games"])
+    if not args.no_micro:
+        if results["games"]:
+            print()
+        benchmarks = {name: benchmark for name, benchmark in micro_benchmarks().items()
+                      if not args.micro or name.startswith(tuple(args.micro))}
+        results["micro"] = time_benchmarks(benchmarks)
+        print_micro(results["micro"])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nsaved baseline to {args.baseline}")
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rerun_slower(results["games"], baseline.get("games", {}), paths, args.threshold,
+                     args.frames, args.flap_every, args.repeat)
+        retime_slower(results["micro"], baseline.get("micro", {}), benchmarks, args.micro_threshold)
+        print()
+        regressions = compare(results, baseline, args.threshold, args.micro_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
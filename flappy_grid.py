@@ -0,0 +1,94 @@
+"""Watch many independent fbirdclaude37extended.py games side by side.
+
+Every game draws straight into its own Surface.subsurface() cell of one
+window, scaled by the grid's zoom (see Game.draw), so there are no
+intermediate surfaces or copies and the whole grid is pushed with a single
+display flip per frame.  Each cell runs its own seed and a gap-seeking bot
+with its own aim, and restarts as soon as its bird dies.
+
+    python flappy_grid.py --games 16 --zoom 0.5
+"""
+import argparse
+import math
+import random
+import sys
+
+import pygame
+
+from fbirdclaude37extended import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, Game
+from flappy_sprites import sprites
+
+SPRITES_PER_GAME = 6  # background, bird and a few pipe colours on screen at once
+
+
+class Grid:
+    def __init__(self, surface, games, zoom=1, columns=None):
+        self.surface = surface
+        self.games = games
+        self.zoom = zoom
+        self.columns = columns or math.ceil(math.sqrt(len(games)))
+        self.cell_size = (max(1, round(SCREEN_WIDTH * zoom)), max(1, round(SCREEN_HEIGHT * zoom)))
+        self.cells = [surface.subsurface(rect) for rect in self.cell_rects(len(games))]
+        # Every game brings its own colours; keep all of them cached at once
+        sprites.max_entries = max(sprites.max_entries, SPRITES_PER_GAME * len(games))
+
+    def cell_rects(self, count):
+        width, height = self.cell_size
+        return [pygame.Rect(i % self.columns * width, i // self.columns * height, width, height)
+                for i in range(count)]
+
+    @staticmethod
+    def window_size(count, zoom=1, columns=None):
+        """Size of a window that holds count cells at zoom."""
+        columns = columns or math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        return (columns * max(1, round(SCREEN_WIDTH * zoom)), rows * max(1, round(SCREEN_HEIGHT * zoom)))
+
+    def draw(self, alpha=1.0):
+        for game, cell in zip(self.games, self.cells):
+            game.draw(cell, alpha, self.zoom)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch many games side by side")
+    parser.add_argument("--games", type=int, default=16, help="number of games")
+    parser.add_argument("--zoom", type=float, default=0.5, help="scale of each cell")
+    parser.add_argument("--columns", type=int, help="cells per row (square grid if omitted)")
+    parser.add_argument("--seed", type=int, help="seed for the games' seeds and the bots' aims")
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode(Grid.window_size(args.games, args.zoom, args.columns))
+    pygame.display.set_caption("Flappy Bird grid")
+    clock = pygame.time.Clock()
+
+    seeds = random.Random(args.seed)
+    games = [Game(seeds.getrandbits(63)) for _ in range(args.games)]
+    aims = [seeds.uniform(-30, 30) for _ in games]
+    states = [game.get_state() for game in games]
+    grid = Grid(screen, games, args.zoom, args.columns)
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_q, pygame.K_ESCAPE):
+                running = False
+
+        for i, game in enumerate(games):
+            y, velocity, _, gap_y = states[i]
+            states[i], _, done = game.step(y > gap_y + aims[i] and velocity > 0)
+            if done:
+                game.reset(seeds.getrandbits(63))
+                states[i] = game.get_state()
+
+        grid.draw()
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
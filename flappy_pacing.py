@@ -0,0 +1,171 @@
+"""Frame pacing and frame-time statistics for the game loops.
+
+Clock.tick() waits with SDL_Delay, which can overshoot by a few
+milliseconds, so frame times jitter.  FramePacer offers these modes:
+
+- "sleep": Clock.tick(), the old behaviour;
+- "busy": Clock.tick_busy_loop(), exact but keeps one core spinning;
+- "hybrid": sleeps until SPIN_MARGIN before the deadline, then spins;
+- "vsync": the display's vsync paces the frames (open it with open_display()
+  and fall back with pacing_mode() when it reports no vsync); tick() only
+  caps the rate at fps if the display refreshes faster than that, so games
+  that advance once per frame keep their speed on high-refresh monitors.
+
+Every mode records frame times in a FrameStats window, giving rolling
+p50/p95/p99 values and a count of frames that missed their deadline.
+add_pacing_arguments() gives every game loop the same --pacing and
+--frame-stats options.
+"""
+import sys
+import time
+from collections import deque
+
+import pygame
+
+PACING_MODES = ("sleep", "busy", "hybrid", "vsync")
+SPIN_MARGIN = 0.002  # seconds before a deadline at which "hybrid" stops sleeping and spins
+MISS_TOLERANCE = 1.5  # a frame longer than this many budgets missed its deadline
+STATS_WINDOW = 600  # frames kept for the rolling percentiles
+DEFAULT_REFRESH_RATE = 60
+VSYNC_PROBE_FRAMES = 5  # presents timed to check that vsync took effect
+VSYNC_MIN_INTERVAL = 0.5  # presents faster than this share of a refresh mean vsync is off
+VSYNC_CAP_SLACK = 1.05  # a display this close to fps paces at fps by itself
+
+
+def add_pacing_arguments(parser):
+    """Add the --pacing and --frame-stats options shared by the game loops to an ArgumentParser."""
+    parser.add_argument("--pacing", choices=PACING_MODES, default="sleep",
+                        help="how frames are paced: Clock.tick (default), busy loop, "
+                             "sleep-then-spin, or display vsync")
+    parser.add_argument("--frame-stats", action="store_true",
+                        help="print frame-time percentiles and missed deadlines on exit")
+
+
+def refresh_rate():
+    """Refresh rate of the current display, if pygame can tell, else DEFAULT_REFRESH_RATE."""
+    get_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+    rate = get_rate() if get_rate is not None else 0
+    return rate or DEFAULT_REFRESH_RATE
+
+
+def open_display(size, flags=0, vsync=False):
+    """pygame.display.set_mode() that asks for vsync when requested.
+
+    Returns (surface, vsync), where vsync tells whether flips really wait for
+    the display.  SDL only applies vsync to renderer-backed displays, so
+    SCALED is added unless OPENGL is used.  Some drivers (dummy, many remote
+    and virtual displays) accept the request without honouring it, so it is
+    checked with presents_in_sync().
+    """
+    if not vsync:
+        return pygame.display.set_mode(size, flags), False
+    if not flags & pygame.OPENGL:
+        flags |= pygame.SCALED
+    try:
+        surface = pygame.display.set_mode(size, flags, vsync=1)
+    except pygame.error:
+        return pygame.display.set_mode(size, flags), False
+    return surface, presents_in_sync(pygame.display.flip)
+
+
+def presents_in_sync(present, frames=VSYNC_PROBE_FRAMES):
+    """Tell whether present() waits for the display's refresh, by timing a few calls."""
+    present()  # the first present can include setup work
+    start = time.perf_counter()
+    for _ in range(frames):
+        present()
+    interval = (time.perf_counter() - start) / frames
+    return interval >= VSYNC_MIN_INTERVAL / refresh_rate()
+
+
+def pacing_mode(mode, vsync):
+    """Return mode, or "hybrid" when "vsync" was asked for but the display does not sync."""
+    if mode == "vsync" and not vsync:
+        print("vsync is not in effect on this display; pacing frames with 'hybrid' instead",
+              file=sys.stderr)
+        return "hybrid"
+    return mode
+
+
+class FrameStats:
+    def __init__(self, budget, window=STATS_WINDOW):
+        self.budget = budget  # seconds per frame; 0 means uncapped, so nothing is missed
+        self.times = deque(maxlen=window)
+        self.frames = 0
+        self.missed = 0
+
+    def add(self, frame_time):
+        self.times.append(frame_time)
+        self.frames += 1
+        if self.budget and frame_time > self.budget * MISS_TOLERANCE:
+            self.missed += 1
+
+    def percentiles(self, *points):
+        """Frame times in seconds at the given percentiles of the rolling window (nearest rank)."""
+        times = sorted(self.times)
+        if not times:
+            return [0.0 for _ in points]
+        last = len(times) - 1
+        return [times[min(last, round(point / 100 * last))] for point in points]
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return (f"{self.frames} frames: p50 {p50 * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, "
+                f"p99 {p99 * 1000:.2f} ms, {self.missed} missed deadlines")
+
+
+class FramePacer:
+    def __init__(self, fps, mode="sleep", window=STATS_WINDOW):
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}")
+        self.fps = fps
+        self.mode = mode
+        self.clock = pygame.time.Clock()
+        self.cap = fps  # frame rate tick() waits for in "hybrid" and "vsync" modes; 0 for none
+        if mode == "vsync":
+            rate = refresh_rate()
+            if rate <= fps * VSYNC_CAP_SLACK:
+                self.cap = 0  # flips already wait long enough
+            budget = 1.0 / min(rate, fps) if fps else 1.0 / rate
+        elif fps:
+            budget = 1.0 / fps
+        else:
+            budget = 0.0
+        self.stats = FrameStats(budget, window)
+        self.deadline = None
+        self.last = None
+
+    def tick(self):
+        """Wait until the next frame is due, record the frame time and return it in seconds."""
+        if self.mode == "sleep":
+            self.clock.tick(self.fps)
+        elif self.mode == "busy":
+            self.clock.tick_busy_loop(self.fps)
+        elif self.cap and self.mode in ("hybrid", "vsync"):
+            self._wait_hybrid(1.0 / self.cap)
+
+        now = time.perf_counter()
+        frame_time = 0.0
+        if self.last is not None:
+            frame_time = now - self.last
+            self.stats.add(frame_time)
+        self.last = now
+        return frame_time
+
+    def idle(self):
+        """Forget the current frame, e.g. after the loop blocked waiting for input."""
+        self.last = None
+        self.deadline = None
+
+    def _wait_hybrid(self, period):
+        now = time.perf_counter()
+        deadline = now if self.deadline is None else self.deadline + period
+        # More than a frame behind: start a new schedule instead of rushing frames out
+        if now > deadline + period:
+            deadline = now
+        remaining = deadline - now - SPIN_MARGIN
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < deadline:
+            pass
+        self.deadline = deadline
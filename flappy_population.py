@@ -0,0 +1,127 @@
+"""Draw and watch large bird populations from flappy_batch.BatchGame.
+
+PopulationRenderer takes NumPy arrays of bird positions (plus optional alive
+flags and sprite kind ids) and draws every bird with a single Surface.blits()
+(or fblits() where pygame provides it) from pre-rendered sprites, so tens of
+thousands of birds cost one C-level blit loop instead of one Python
+draw call each.
+
+    python flappy_population.py --birds 10000
+"""
+import argparse
+import sys
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+from fbirdclaude37extended import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GROUND_HEIGHT, BIRD_SIZE, BIRD_SHAPES,
+    BLACK, LIGHT_BLUE, DARK_BROWN, font, random_dark_color,
+)
+from flappy_batch import BIRD_X, BatchGame
+from flappy_sprites import sprites
+from flappy_text import NumberLabel
+
+
+class PopulationRenderer:
+    # kinds is a sequence of (shape, color); the kind array passed to draw()
+    # indexes into it.  alpha (0-255) makes every bird translucent so dense
+    # flocks show where most birds are.
+    def __init__(self, kinds, size=BIRD_SIZE, alpha=None):
+        self.size = size
+        self.half = size // 2
+        self.sprites = []
+        for shape, color in kinds:
+            sprite = sprites.bird(shape, color, size)
+            if alpha is not None:
+                # Copy so the shared cached sprite stays opaque; RLE keeps
+                # colorkey-plus-alpha blits about as fast as opaque ones
+                sprite = sprite.copy()
+                sprite.set_alpha(alpha, pygame.RLEACCEL)
+            self.sprites.append(sprite)
+        self._sprite_array = np.empty(len(self.sprites), dtype=object)
+        self._sprite_array[:] = self.sprites
+
+    def draw(self, surface, x, y, kind=None, alive=None):
+        """Blit one sprite centred on each (x, y) in one call and return how many were drawn.
+
+        x may be a scalar shared by every bird.  kind selects each bird's
+        sprite (the first kind if omitted).  When alive is given, only the
+        birds it flags are drawn.
+        """
+        y = np.asarray(y)
+        x = np.broadcast_to(x, y.shape)
+        if alive is not None:
+            y = y[alive]
+            x = x[alive]
+            if kind is not None:
+                kind = np.asarray(kind)[alive]
+        # astype truncates like blit does for float positions
+        positions = np.column_stack(((x - self.half).astype(np.int64),
+                                     (y - self.half).astype(np.int64))).tolist()
+        if kind is None:
+            sources = repeat(self.sprites[0])
+        else:
+            sources = self._sprite_array[kind].tolist()
+        fblits = getattr(surface, "fblits", None)
+        if fblits is not None:
+            fblits(zip(sources, positions))
+        else:
+            surface.blits(zip(sources, positions), False)
+        return len(positions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a BatchGame population fly")
+    parser.add_argument("--birds", type=int, default=10000, help="population size")
+    parser.add_argument("--seed", type=int, help="seed for the pipe course and the policy")
+    parser.add_argument("--alpha", type=int, help="bird opacity 0-255 (opaque if omitted)")
+    parser.add_argument("--show-dead", action="store_true", help="keep drawing birds where they died")
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Flappy Bird population")
+    clock = pygame.time.Clock()
+
+    rng = np.random.default_rng(args.seed)
+    game = BatchGame(args.birds, args.seed)
+    # A noisy "aim for the gap" policy, so the flock spreads out and thins
+    aim = rng.normal(0, 40, args.birds)
+    kinds = [(shape, random_dark_color()) for shape in BIRD_SHAPES for _ in range(2)]
+    kind = rng.integers(len(kinds), size=args.birds)
+    renderer = PopulationRenderer(kinds, alpha=args.alpha)
+    alive_label = NumberLabel(font, "Alive: ", BLACK)
+    background = sprites.background(LIGHT_BLUE, DARK_BROWN, (SCREEN_WIDTH, SCREEN_HEIGHT), GROUND_HEIGHT)
+
+    state = game.get_state()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_q, pygame.K_ESCAPE):
+                running = False
+
+        if game.done:
+            game.reset()
+            state = game.get_state()
+        state, _, alive = game.step(state[:, 0] > state[:, 3] + aim)
+
+        screen.blit(background, (0, 0))
+        pipe_blits = []
+        for pipe in game.pipes:
+            pipe_blits.extend(pipe.get_blits(1.0))
+        screen.blits(pipe_blits, False)
+        renderer.draw(screen, BIRD_X, game.y / game.scale, kind, None if args.show_dead else alive)
+        alive_label.draw(screen, int(np.count_nonzero(alive)), topright=(SCREEN_WIDTH - 10, 10))
+
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
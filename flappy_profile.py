@@ -0,0 +1,176 @@
+"""Profile any fbird*.py game for a fixed number of frames.
+
+    python flappy_profile.py fbirdqwq32b425bpw.py --frames 600
+    python flappy_profile.py fbirdclaude37extended.py --windowed -- --seed 1
+
+The game runs unmodified through flappy_runner (scripted SPACE presses,
+uncapped clock, dummy display unless --windowed), once under cProfile and
+once under a sampling profiler.  Uncapped, every presented frame is 1/60 s
+of game time, so games that simulate by elapsed time (claude37) still run
+one update per frame and the profile covers updating as well as drawing.
+Frames presented through claude37's texture backend count too.  It writes
+to --out:
+
+- <game>.pstats: cProfile statistics, for pstats, snakeviz and friends;
+- <game>.collapsed: "frame;frame;frame count" lines, the collapsed-stack
+  format read by flamegraph.pl, speedscope and inferno.
+
+The sampler records the game's stack every --interval seconds instead of
+tracing every call, so it barely slows the game down and its numbers are
+closer to an unprofiled run.
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+from flappy_runner import run_script
+
+
+class SamplingProfiler:
+    # Counts the stacks of the thread that starts it, sampled every
+    # interval seconds of wall time.  Stacks are kept as tuples of code
+    # objects, outermost first, cut at root_file's module code so the
+    # runner's own frames are left out.
+    #
+    # Where the OS has interval timers, a SIGALRM handler takes the samples
+    # on the game's own thread.  Elsewhere a background thread reads the
+    # game thread's stack, but it can only run when it gets the GIL, which
+    # pygame releases in display.flip() but not while blitting; those
+    # samples pile up in flip() and are only a rough guide.  Either way,
+    # time in pygame's C functions is charged to the Python function that
+    # called them.
+    def __init__(self, interval=0.001, root_file=None):
+        self.interval = interval
+        self.root_file = root_file
+        self.counts = Counter()
+        self.samples = 0
+        self.use_signal = hasattr(signal, "setitimer")
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous_handler = None
+
+    def start(self):
+        if self.use_signal:
+            self._previous_handler = signal.signal(signal.SIGALRM, self._handle_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self._thread_id = threading.get_ident()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self.use_signal:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+        else:
+            self._stop.set()
+            self._thread.join()
+
+    def _handle_signal(self, signum, frame):
+        self.sample(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.sample(frame)
+
+    def sample(self, frame):
+        root_file = self.root_file
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(code)
+            if code.co_filename == root_file and code.co_name == "<module>":
+                break
+            frame = frame.f_back
+        # Samples taken outside the game (startup, pygame.quit()) are dropped
+        if frame is not None or root_file is None:
+            self.counts[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path):
+        names = {}
+
+        def name(code):
+            label = names.get(code)
+            if label is None:
+                label = names[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            return label
+
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(";".join(name(code) for code in stack))
+                f.write(f" {count}\n")
+
+
+def profile_cprofile(path, frames, out, **run_options):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        drawn = run_script(path, frames, **run_options)
+    finally:
+        profiler.disable()
+    profiler.dump_stats(out)
+    return drawn, profiler
+
+
+def profile_sampling(path, frames, out, interval, **run_options):
+    profiler = SamplingProfiler(interval, root_file=os.path.abspath(path))
+    profiler.start()
+    try:
+        drawn = run_script(path, frames, **run_options)
+    finally:
+        profiler.stop()
+    profiler.write_collapsed(out)
+    return drawn, profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a game for a fixed number of frames")
+    parser.add_argument("game", help="game file, e.g. fbirdcgpto1pro.py")
+    parser.add_argument("--frames", type=int, default=600, help="frames to run (default 600)")
+    parser.add_argument("--flap-every", type=int, default=10, help="press SPACE every N frames (0: never)")
+    parser.add_argument("--windowed", action="store_true", help="open a real window instead of the dummy driver")
+    parser.add_argument("--capped", action="store_true", help="keep the game's own frame cap and pauses")
+    parser.add_argument("--profiler", choices=("both", "cprofile", "sampling"), default="both")
+    parser.add_argument("--interval", type=float, default=0.001, help="sampling interval in seconds")
+    parser.add_argument("--out", default="profiles", help="output directory (default profiles/)")
+    parser.add_argument("--top", type=int, default=15, help="functions to list from the cProfile run")
+    parser.epilog = "Arguments after -- are passed to the game."
+    argv = list(sys.argv[1:] if argv is None else argv)
+    game_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, game_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    run_options = dict(flap_every=args.flap_every, headless=not args.windowed,
+                       uncapped=not args.capped, argv=game_args)
+    os.makedirs(args.out, exist_ok=True)
+    stem = os.path.join(args.out, os.path.splitext(os.path.basename(args.game))[0])
+
+    if args.profiler in ("both", "cprofile"):
+        start = time.perf_counter()
+        drawn, profiler = profile_cprofile(args.game, args.frames, stem + ".pstats", **run_options)
+        print(f"cProfile: {drawn} frames in {time.perf_counter() - start:.2f}s -> {stem}.pstats")
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(args.top)
+
+    if args.profiler in ("both", "sampling"):
+        start = time.perf_counter()
+        drawn, profiler = profile_sampling(args.game, args.frames, stem + ".collapsed", args.interval,
+                                           **run_options)
+        print(f"sampling: {drawn} frames in {time.perf_counter() - start:.2f}s, "
+              f"{profiler.samples} samples -> {stem}.collapsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Run any fbird*.py game unattended for a fixed number of frames.
+
+The game file is executed as __main__, unmodified, with pygame patched so
+that:
+
+- every pygame.display.flip()/update() (or flappy_texture's
+  TextureScreen.present()) counts one frame, and the run stops after the
+  requested number of frames by raising FramesDone out of the game loop;
+- SPACE is pressed every flap_every frames, so birds flap, crash and restart;
+- with uncapped=True, Clock.tick(), pygame.event.wait() and
+  pygame.time.wait()/delay() never sleep, so a run measures how fast the
+  loop can go rather than its frame cap or pauses.  The game then also runs
+  on game time: pygame.time.get_ticks(), and time.perf_counter() when
+  called from the game file itself, advance frame_time per presented frame.
+  Games that move things by elapsed time (claude37's fixed-timestep loop,
+  the get_ticks() pipe timers) therefore play exactly as they would at
+  1/frame_time FPS, however fast the frames come.  Everything else,
+  profilers and benchmarks included, keeps the real clock.
+
+With headless=True SDL's dummy video and audio drivers are used.  Modules
+imported by the game are dropped afterwards, so the next run starts fresh.
+"""
+import os
+import runpy
+import sys
+import time
+
+import pygame
+
+
+FRAME_TIME = 1 / 60  # game time per presented frame in uncapped runs, in seconds
+
+
+class FramesDone(Exception):
+    """Raised from pygame.display.flip()/update() once the requested frames are drawn."""
+
+
+_Clock = pygame.time.Clock
+
+
+class UncappedClock:
+    # Stands in for pygame.time.Clock (which cannot be subclassed); ticks
+    # are still measured but never wait
+    def __init__(self):
+        self.clock = _Clock()
+
+    def tick(self, framerate=0):
+        return self.clock.tick()
+
+    def tick_busy_loop(self, framerate=0):
+        return self.clock.tick()
+
+    def get_time(self):
+        return self.clock.get_time()
+
+    def get_rawtime(self):
+        return self.clock.get_rawtime()
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+def _wait_without_blocking(timeout=0):
+    return pygame.event.poll()
+
+
+def _no_delay(milliseconds):
+    return 0
+
+
+def flap_event():
+    return pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" ",
+                              scancode=pygame.KSCAN_SPACE)
+
+
+def run_script(path, frames, flap_every=10, headless=True, uncapped=True, argv=(), on_frame=None,
+               frame_time=FRAME_TIME):
+    """Run the game at path until it has drawn frames frames (or exits) and return the frame count.
+
+    on_frame(count), if given, is called after every frame is presented.
+    """
+    path = os.path.abspath(path)
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    try:
+        from flappy_texture import TextureScreen
+    except ImportError:  # no pygame._sdl2
+        TextureScreen = None
+
+    count = 0
+
+    def frame_done():
+        nonlocal count
+        count += 1
+        if on_frame is not None:
+            on_frame(count)
+        if flap_every and count % flap_every == 0:
+            pygame.event.post(flap_event())
+        if count >= frames:
+            raise FramesDone
+
+    original_flip = pygame.display.flip
+    original_update = pygame.display.update
+    original_clock = pygame.time.Clock
+    original_wait = pygame.event.wait
+    original_time_wait = pygame.time.wait
+    original_delay = pygame.time.delay
+    original_get_ticks = pygame.time.get_ticks
+    original_perf_counter = time.perf_counter
+    original_present = TextureScreen.present if TextureScreen is not None else None
+    start = original_perf_counter()
+
+    def flip():
+        original_flip()
+        frame_done()
+
+    def update(*args):
+        original_update(*args)
+        frame_done()
+
+    def present(self):
+        original_present(self)
+        frame_done()
+
+    def get_ticks():
+        return int(count * frame_time * 1000)
+
+    def perf_counter():
+        # Only the game's own code sees game time
+        if sys._getframe(1).f_code.co_filename == path:
+            return start + count * frame_time
+        return original_perf_counter()
+
+    pygame.display.flip = flip
+    pygame.display.update = update
+    if TextureScreen is not None:
+        TextureScreen.present = present
+    if uncapped:
+        pygame.time.Clock = UncappedClock
+        pygame.event.wait = _wait_without_blocking
+        pygame.time.wait = _no_delay
+        pygame.time.delay = _no_delay
+        pygame.time.get_ticks = get_ticks
+        time.perf_counter = perf_counter
+
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    saved_modules = set(sys.modules)
+    sys.argv = [path, *argv]
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except (FramesDone, SystemExit):
+        pass
+    finally:
+        pygame.display.flip = original_flip
+        pygame.display.update = original_update
+        if TextureScreen is not None:
+            TextureScreen.present = original_present
+        pygame.time.Clock = original_clock
+        pygame.event.wait = original_wait
+        pygame.time.wait = original_time_wait
+        pygame.time.delay = original_delay
+        pygame.time.get_ticks = original_get_ticks
+        time.perf_counter = original_perf_counter
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        pygame.quit()
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+    return count
@@ -0,0 +1,38 @@
+"""Simulation-tick event scheduler shared by the games.
+
+Timed events (pipe spawns) are counted in simulation ticks rather than
+wall-clock milliseconds, so they follow game time under fast-forward, frame
+drops and headless runs, and a spawn can never fire on several frames in a
+row the way a `get_ticks() % period < window` test does.
+"""
+import heapq
+
+
+class Scheduler:
+    # Priority queue of timed events counted in simulation ticks (frames).
+    # Events are plain (due, seq, action, interval) tuples; handlers maps each
+    # action name to the callable that runs it.
+    def __init__(self):
+        self.handlers = {}
+        self.clear()
+
+    def clear(self):
+        self.tick = 0
+        self.queue = []
+        self.seq = 0  # tie-breaker so events due on the same tick run in order
+
+    def schedule(self, delay, action, interval=0):
+        """Run action delay ticks from now, then every interval ticks if interval > 0."""
+        heapq.heappush(self.queue, (self.tick + delay, self.seq, action, interval))
+        self.seq += 1
+
+    def advance(self):
+        """Move forward one tick and run every event that is now due."""
+        self.tick += 1
+        queue = self.queue
+        while queue and queue[0][0] <= self.tick:
+            due, _, action, interval = heapq.heappop(queue)
+            if interval > 0:
+                heapq.heappush(queue, (due + interval, self.seq, action, interval))
+                self.seq += 1
+            self.handlers[action]()
@@ -0,0 +1,84 @@
+"""Pre-rendered sprite cache for the bird shapes, pipe bodies and backgrounds.
+
+Bird shapes are rasterised once per (shape, colour, size), pipe bodies once
+per (colour, width, height) and the static sky-plus-ground layer once per
+colour pair into surfaces that are converted to the display format, so
+drawing a frame is only blits.  The cache is a bounded
+LRU, so new random colours on every reset do not grow it forever.
+"""
+from collections import OrderedDict
+
+import pygame
+
+COLORKEY = (255, 0, 255)  # transparent background; never a bird colour
+
+
+class SpriteCache:
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key, render):
+        """Return the surface stored under key, creating it with render() on a miss."""
+        entries = self.entries
+        surface = entries.get(key)
+        if surface is None:
+            surface = render()
+            # convert() needs a display mode; headless surfaces stay as they are
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            entries[key] = surface
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(key)
+        return surface
+
+    def bird(self, shape, color, size):
+        """Bird sprite; blit it at (x - size // 2, y - size // 2)."""
+        return self.get(("bird", shape, color, size), lambda: render_bird(shape, color, size))
+
+    def pipe(self, color, width, height):
+        """Solid pipe column; blit an area of it for each pipe segment."""
+        return self.get(("pipe", color, width, height), lambda: render_pipe(color, width, height))
+
+    def background(self, sky_color, ground_color, size, ground_height):
+        """Sky with the ground strip along the bottom; blit it at (0, 0) instead of clearing."""
+        return self.get(("background", sky_color, ground_color, size, ground_height),
+                        lambda: render_background(sky_color, ground_color, size, ground_height))
+
+    def clear(self):
+        self.entries.clear()
+
+
+def render_bird(shape, color, size):
+    half = size // 2
+    # One spare row/column so the triangle's base and the circle's edge fit
+    surface = pygame.Surface((size + 1, size + 1))
+    surface.fill(COLORKEY)
+    surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    if shape == "square":
+        pygame.draw.rect(surface, color, (0, 0, size, size))
+    elif shape == "circle":
+        pygame.draw.circle(surface, color, (half, half), half)
+    elif shape == "triangle":
+        pygame.draw.polygon(surface, color, [(half, 0), (0, size), (size, size)])
+    return surface
+
+
+def render_pipe(color, width, height):
+    surface = pygame.Surface((width, height))
+    surface.fill(color)
+    return surface
+
+
+def render_background(sky_color, ground_color, size, ground_height):
+    width, height = size
+    surface = pygame.Surface(size)
+    surface.fill(sky_color)
+    surface.fill(ground_color, (0, height - ground_height, width, ground_height))
+    return surface
+
+
+# Shared cache used by the games
+sprites = SpriteCache()
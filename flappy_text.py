@@ -0,0 +1,117 @@
+"""Cached text rendering for the HUD and game-over screens.
+
+Font rasterisation is one of the most expensive things a frame can do, so:
+
+- get_font() builds each (name, size, bold) font once;
+- Label re-renders its surface only when its string changes;
+- NumberLabel composes "<prefix><number>" from a pre-rendered digit atlas
+  when the number changes, so a changing score never goes through the font
+  renderer, and keeps the result until it changes again: a steady score is
+  one blit per frame.  Glyphs are placed side by side without kerning, so
+  the text can be a few pixels wider than font.render() of the same string
+  (with pygame's default font at 36 px, "Score: 111" is 120 px instead
+  of 115).
+
+Surfaces are rendered on first use, so they can be converted to the display
+format once a window exists.
+"""
+import pygame
+
+_fonts = {}
+
+
+def get_font(name, size, bold=False):
+    """Return a cached font; name None is pygame's default font."""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if name is None:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def _prepare(surface):
+    # convert_alpha() needs a display mode; headless surfaces stay as they are
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+class Label:
+    def __init__(self, font, color, text=None, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.text = text
+        self.surface = None
+
+    def render(self, text=None):
+        """Return the surface for text (or the current text), rendering only on change."""
+        if text is None:
+            text = self.text
+        if text != self.text or self.surface is None:
+            self.text = text
+            self.surface = _prepare(self.font.render(text, self.antialias, self.color))
+        return self.surface
+
+
+class NumberLabel:
+    def __init__(self, font, prefix, color, antialias=True):
+        self.font = font
+        self.prefix_text = prefix
+        self.color = color
+        self.antialias = antialias
+        self.prefix = None
+        self.digits = None
+        self.number = None
+        self.surface = None
+        self.anchor = None
+        self.rect = None
+
+    def _render_atlas(self):
+        render = self.font.render
+        self.prefix = _prepare(render(self.prefix_text, self.antialias, self.color))
+        self.digits = [_prepare(render(str(d), self.antialias, self.color)) for d in range(10)]
+        self.digit_widths = [digit.get_width() for digit in self.digits]
+
+    def size(self, number):
+        """Width and height of the rendered text for number."""
+        if self.digits is None:
+            self._render_atlas()
+        widths = self.digit_widths
+        width = self.prefix.get_width()
+        for ch in str(number):
+            width += widths[ord(ch) - 48]
+        return width, self.prefix.get_height()
+
+    def render(self, number):
+        """Return the surface for "<prefix><number>", composing it only when number changes."""
+        if number != self.number or self.surface is None:
+            text = pygame.Surface(self.size(number), pygame.SRCALPHA)
+            # Glyphs sit side by side, so taking the per-channel maximum over
+            # the transparent surface copies each one exactly, alpha included
+            text.blit(self.prefix, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x = self.prefix.get_width()
+            digits = self.digits
+            widths = self.digit_widths
+            for ch in str(number):
+                d = ord(ch) - 48
+                text.blit(digits[d], (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                x += widths[d]
+            self.number = number
+            self.surface = _prepare(text)
+            self.anchor = None
+        return self.surface
+
+    def draw(self, surface, number, **anchor):
+        """Blit "<prefix><number>" placed like Surface.get_rect(**anchor); return its rect."""
+        text = self.render(number)
+        if anchor != self.anchor:
+            self.anchor = anchor
+            self.rect = text.get_rect(**anchor)
+        surface.blit(text, self.rect)
+        return self.rect
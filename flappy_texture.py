@@ -0,0 +1,91 @@
+"""SDL renderer backend: draw the games with textures instead of surface blits.
+
+TextureScreen has the blit()/blits() interface the draw methods use on a
+display Surface, so Game.draw(), Bird.draw(), Pipe.draw() and the HUD labels
+run on it unchanged.  Each source surface is uploaded to a Texture the first
+time it is drawn and kept for as long as the surface lives, so a frame is a
+list of texture copies through SDL's batched renderer.  That works with the
+GPU renderer and with SDL's software renderer on machines without one.
+
+Sources are assumed not to change after they are first drawn, which holds
+for the cached sprites, backgrounds and text surfaces.
+"""
+import weakref
+
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from flappy_pacing import presents_in_sync
+
+
+class TextureScreen:
+    def __init__(self, renderer, size):
+        self.renderer = renderer
+        self.size = size
+        self.textures = weakref.WeakKeyDictionary()
+        self.vsync = False
+
+    @classmethod
+    def open(cls, title, logical_size, window_size=None, software=False, vsync=False):
+        """Create a window and renderer that scale logical_size to the window.
+
+        The screen's vsync attribute tells whether presents really wait for
+        the display (see flappy_pacing.presents_in_sync()).
+        """
+        window = Window(title, window_size or logical_size)
+        renderer = Renderer(window, accelerated=0 if software else -1, vsync=vsync)
+        renderer.logical_size = logical_size
+        screen = cls(renderer, logical_size)
+        screen.vsync = vsync and presents_in_sync(screen.present)
+        return screen
+
+    def texture(self, surface):
+        """Return the texture for surface, uploading it on first use."""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            alpha = surface.get_alpha()
+            if alpha is not None:
+                texture.alpha = alpha
+            self.textures[surface] = texture
+        return texture
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if area is None:
+            area = source.get_rect()
+        else:
+            area = pygame.Rect(area)
+        dest_rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+        self.texture(source).draw(area, dest_rect)
+        return dest_rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        blit = self.blit
+        rects = [blit(*args) for args in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None):
+        renderer = self.renderer
+        renderer.draw_color = color
+        if rect is None:
+            renderer.clear()
+        else:
+            renderer.fill_rect(rect)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def present(self):
+        """Show the frame; the renderer's equivalent of pygame.display.flip()."""
+        renderer = self.renderer
+        renderer.present()
+        # The back buffer is undefined after a present; clear it (and the
+        # letterbox borders) for the next frame
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
@@ -0,0 +1,105 @@
+"""Per-phase frame timing with an on-screen overlay and CSV output.
+
+A PhaseTimer splits each frame of a game loop into named phases.  The loop
+calls start() when a frame begins and lap(phase) after each piece of work;
+laps to the same phase within a frame add up, so interleaved work (say,
+updates and collision checks) is still attributed correctly.  end_frame()
+stores the frame in a rolling window and, if a CSV file was given, writes it
+as one row of nanoseconds.  draw() shows the rolling average and worst time
+of each phase.
+"""
+import csv
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+from flappy_text import Label, get_font
+
+TIMING_WINDOW = 120  # frames in the rolling average and worst case
+OVERLAY_REFRESH = 15  # frames between overlay text updates, so it stays readable and cheap
+OVERLAY_FONT_SIZE = 20
+OVERLAY_COLUMN_GAP = 12
+OVERLAY_BACKGROUND = (0, 0, 0, 160)
+OVERLAY_COLOR = (255, 255, 255)
+
+
+class PhaseTimer:
+    def __init__(self, phases, csv_path=None, window=TIMING_WINDOW):
+        self.phases = tuple(phases)
+        self.samples = {phase: deque(maxlen=window) for phase in self.phases}
+        self.current = dict.fromkeys(self.phases, 0)
+        self.frame = 0
+        self.mark = perf_counter_ns()
+        self.csv_file = None
+        self.csv_writer = None
+        if csv_path:
+            self.csv_file = open(csv_path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(("frame", *(f"{phase}_ns" for phase in self.phases)))
+        self.font = get_font(None, OVERLAY_FONT_SIZE)
+        # One label per table cell: (phase, avg, max) for the header and each phase
+        self.labels = [[Label(self.font, OVERLAY_COLOR, "") for _ in range(3)]
+                       for _ in range(len(self.phases) + 1)]
+        self.panel = None
+
+    def start(self):
+        """Begin timing from now; time since the last lap is not counted."""
+        self.mark = perf_counter_ns()
+
+    def lap(self, phase):
+        """Add the time since the last start() or lap() to phase."""
+        now = perf_counter_ns()
+        self.current[phase] += now - self.mark
+        self.mark = now
+
+    def end_frame(self):
+        current = self.current
+        for phase in self.phases:
+            self.samples[phase].append(current[phase])
+        if self.csv_writer is not None:
+            self.csv_writer.writerow((self.frame, *(current[phase] for phase in self.phases)))
+        self.frame += 1
+        self.current = dict.fromkeys(self.phases, 0)
+
+    def averages(self):
+        """Rolling mean of each phase in nanoseconds."""
+        return {phase: sum(times) / len(times) if times else 0.0 for phase, times in self.samples.items()}
+
+    def worst(self):
+        """Longest time of each phase in the rolling window, in nanoseconds."""
+        return {phase: max(times, default=0) for phase, times in self.samples.items()}
+
+    def draw(self, surface, topleft=(10, 10)):
+        """Draw the timing table and return its rect."""
+        if self.panel is None or self.frame % OVERLAY_REFRESH == 0:
+            self._render_panel()
+        return surface.blit(self.panel, topleft)
+
+    def _render_panel(self):
+        averages = self.averages()
+        worst = self.worst()
+        rows = [("phase", "avg ms", "max ms")]
+        for phase in self.phases:
+            rows.append((phase, f"{averages[phase] / 1e6:.2f}", f"{worst[phase] / 1e6:.2f}"))
+        cells = [[label.render(text) for label, text in zip(labels, row)]
+                 for labels, row in zip(self.labels, rows)]
+        widths = [max(row[column].get_width() for row in cells) for column in range(3)]
+        line_height = self.font.get_linesize()
+        size = (sum(widths) + OVERLAY_COLUMN_GAP * 2 + 12, line_height * len(cells) + 8)
+        self.panel = pygame.Surface(size, pygame.SRCALPHA)
+        self.panel.fill(OVERLAY_BACKGROUND)
+        for i, (name, average, longest) in enumerate(cells):
+            y = 4 + i * line_height
+            # Phase names left-aligned, numbers right-aligned
+            self.panel.blit(name, (6, y))
+            right = 6 + widths[0] + OVERLAY_COLUMN_GAP + widths[1]
+            self.panel.blit(average, (right - average.get_width(), y))
+            right += OVERLAY_COLUMN_GAP + widths[2]
+            self.panel.blit(longest, (right - longest.get_width(), y))
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
@@ -0,0 +1,244 @@
+"""Round-trip and equivalence checks for the fbirdclaude37extended.py engine.
+
+    python -m pytest -q test_engine.py
+
+Covers the claims the file formats and fast paths rest on: snapshots and
+replay files reproduce a game exactly, seeking lands on the same state as
+a straight replay, swept collision catches a step that carries the bird
+past a pipe lip, the CourseIndex agrees with testing every pipe, and
+BatchGame birds end where single games do.
+"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pytest
+
+from fbirdclaude37extended import (
+    GROUND_HEIGHT, KEYFRAME_INTERVAL, PIPE_GAP, PIPE_SPEED, SCREEN_HEIGHT,
+    Game, Recording, replay, seek, sweep_window, verify,
+)
+
+PHYSICS = pytest.mark.parametrize("fixed_point", [False, True], ids=["float", "fixed"])
+
+
+def gap_seeker(game, offset=0):
+    """Return a policy(state) for game that aims offset px below the gap centre."""
+    offset *= game.scale
+    return lambda state: state[0] > state[3] + offset and state[1] > 0
+
+
+def record(seed, frames, fixed_point=False, offset=0):
+    """Play a bot game like main() does and return (recording, snapshots by frame)."""
+    game = Game(fixed_point=fixed_point)
+    game.reset(seed)
+    recording = Recording(seed)
+    policy = gap_seeker(game, offset)
+    snapshots = {0: game.snapshot()}
+    state = game.get_state()
+    while game.frame < frames and not game.game_over:
+        if policy(state):
+            recording.flaps.append(game.frame)
+        state, _, _ = game.step(policy(state))
+        recording.capture(game)
+        snapshots[game.frame] = game.snapshot()
+    recording.finish(game)
+    return recording, snapshots
+
+
+def pipe_hit(game):
+    # The per-pipe swept test the CourseIndex replaced: every pipe is checked
+    # against the bird's box over the whole last step
+    bird = game.bird
+    scale = game.scale
+    size = bird.size
+    y = bird.prev_y / scale - size // 2
+    dy = (bird.y - bird.prev_y) / scale
+    for pipe in game.pipes:
+        dx = (pipe.prev_x - pipe.x) / scale
+        window = sweep_window(bird.x - size // 2 - dx, size, dx, pipe.x / scale, pipe.width)
+        if window is None:
+            continue
+        y0 = y + dy * window[0]
+        y1 = y + dy * window[1]
+        low, high = min(y0, y1), max(y0, y1)
+        if low < pipe.gap_y - PIPE_GAP // 2 and high > -size:
+            return True
+        if low < SCREEN_HEIGHT - GROUND_HEIGHT and high > pipe.gap_y + PIPE_GAP // 2 - size:
+            return True
+    return False
+
+
+@PHYSICS
+def test_snapshot_round_trip(fixed_point):
+    _, snapshots = record(3, 1500, fixed_point)
+    for frame in (0, 1, 250, max(snapshots)):
+        game = Game(fixed_point=fixed_point)
+        game.restore(snapshots[frame])
+        assert game.snapshot() == snapshots[frame]
+
+
+@PHYSICS
+def test_snapshot_continues_identically(fixed_point):
+    original = Game(7, fixed_point=fixed_point)
+    policy = gap_seeker(original)
+    state = original.get_state()
+    for _ in range(400):
+        state, _, done = original.step(policy(state))
+    assert not done
+    copy = Game(fixed_point=fixed_point)
+    copy.restore(original.snapshot())
+    copy_state = copy.get_state()
+    assert copy_state == state
+    for _ in range(2000):
+        state, _, done = original.step(policy(state))
+        copy_state, _, _ = copy.step(policy(copy_state))
+        assert copy_state == state
+        if done:
+            break
+    assert copy.snapshot() == original.snapshot()
+
+
+def test_snapshot_rejects_other_physics():
+    with pytest.raises(ValueError):
+        Game(fixed_point=True).restore(Game(fixed_point=False).snapshot())
+
+
+def test_replay_file_round_trip(tmp_path):
+    recording, snapshots = record(11, 3 * KEYFRAME_INTERVAL + 50)
+    assert recording.frames > 2 * KEYFRAME_INTERVAL, "bot died too early to cross keyframes"
+    path = tmp_path / "game.fbr"
+    recording.save(path)
+    loaded = Recording.load(path)
+    assert (loaded.seed, loaded.score, loaded.frames, loaded.finished) == (
+        recording.seed, recording.score, recording.frames, recording.finished)
+    assert list(loaded.flaps) == list(recording.flaps)
+    assert loaded.keyframe_interval == recording.keyframe_interval
+    assert loaded.keyframes == recording.keyframes
+    assert verify(loaded)
+    assert replay(loaded).snapshot() == snapshots[recording.frames]
+
+
+def test_seek_across_keyframes(tmp_path):
+    recording, snapshots = record(11, 3 * KEYFRAME_INTERVAL + 50)
+    path = tmp_path / "game.fbr"
+    recording.save(path)
+    loaded = Recording.load(path)
+    interval = KEYFRAME_INTERVAL
+    for frame in (0, 1, interval - 1, interval, interval + 1, 2 * interval + 17, recording.frames):
+        assert seek(loaded, frame).snapshot() == snapshots[frame], frame
+
+
+def test_seek_with_missing_keyframe():
+    # seek() goes by the frame numbers stored with the keyframes, not by
+    # their position in the list
+    recording, snapshots = record(11, 3 * KEYFRAME_INTERVAL + 50)
+    assert [frame for frame, _ in recording.keyframes][:3] == [
+        KEYFRAME_INTERVAL, 2 * KEYFRAME_INTERVAL, 3 * KEYFRAME_INTERVAL]
+    del recording.keyframes[1]
+    interval = KEYFRAME_INTERVAL
+    for frame in (interval - 1, interval + 1, 2 * interval, 2 * interval + 17, 3 * interval, recording.frames):
+        assert seek(recording, frame).snapshot() == snapshots[frame], frame
+
+
+def test_build_keyframes_matches_recorded():
+    recording, _ = record(11, 2 * KEYFRAME_INTERVAL + 10)
+    rebuilt = Recording(recording.seed, recording.flaps, frames=recording.frames)
+    rebuilt.build_keyframes()
+    assert rebuilt.keyframes == recording.keyframes
+
+
+@PHYSICS
+def test_step_past_pipe_lip_collides(fixed_point):
+    # One step moves the bird's box from left of the pipe, level with the top
+    # pipe, to inside the pipe's span but below its lip: both end positions
+    # clear the pipe, the swept box clips its corner.  The pipe starts at most
+    # one step right of the bird, so they overlap for the last third of the
+    # step or more, when the bird's top is still above the lip
+    game = Game(11, fixed_point=fixed_point)
+    scale = game.scale
+    policy = gap_seeker(game)
+    state = game.get_state()
+    bird = game.bird
+    right = bird.x + bird.size // 2
+    while not (game.pipes and right < game.pipes[0].x / scale <= right + PIPE_SPEED):
+        state, _, done = game.step(policy(state))
+        assert not done
+    pipe = game.pipes[0]
+    lip = pipe.gap_y - PIPE_GAP // 2
+    bird.y = (lip - 25 + bird.size // 2) * scale
+    bird.velocity = 30 * scale - bird.gravity  # after gravity, the step is 30 px down
+    start = bird.get_rect()
+    assert start.collidelist(pipe.get_rects()) == -1
+    game.step(False)
+    end = bird.get_rect()
+    assert end.top == lip + 5
+    assert end.collidelist(pipe.get_rects()) == -1
+    assert game.game_over
+
+
+def test_o1pro_swept_collision_catches_lip():
+    from fbirdcgpto1pro import swept_collision
+
+    # A 20 px box steps (3, 30) past the bottom-left corner of a top pipe
+    # whose lip is at y=200
+    pipe = pygame.Rect(100, 0, 60, 200)
+    assert not pygame.Rect(79, 185, 20, 20).colliderect(pipe)
+    assert not pygame.Rect(82, 215, 20, 20).colliderect(pipe)
+    assert swept_collision(79, 185, 20, 20, 3, 30, *pipe)
+    # The same step 10 px lower passes under the lip
+    assert not swept_collision(79, 195, 20, 20, 3, 30, *pipe)
+
+
+@PHYSICS
+def test_course_index_matches_per_pipe_sweep(fixed_point):
+    # Bots aiming at different heights in the gap die on every part of the pipes
+    rng = random.Random(0)
+    deaths = 0
+    for run in range(300):
+        game = Game(run, fixed_point=fixed_point)
+        policy = gap_seeker(game, rng.uniform(-70, 70))
+        state = game.get_state()
+        for _ in range(1500):
+            state, _, done = game.step(policy(state))
+            bird = game.bird
+            half = bird.size // 2 * game.scale
+            edge = bird.y + half > game.ground_y or bird.y - half < 0
+            assert done == (edge or pipe_hit(game)), (run, game.frame)
+            if done:
+                deaths += not edge
+                break
+    assert deaths > 100
+
+
+@PHYSICS
+def test_batch_matches_single_games(fixed_point):
+    np = pytest.importorskip("numpy")
+    from flappy_batch import BatchGame
+
+    birds, frames, seed = 64, 6000, 5
+    offsets = np.linspace(-60, 60, birds)
+    batch = BatchGame(birds, seed, fixed_point=fixed_point)
+    state = batch.get_state()
+    for _ in range(frames):
+        if batch.done:
+            break
+        flaps = (state[:, 0] > state[:, 3] + offsets * batch.scale) & (state[:, 1] > 0)
+        state, _, _ = batch.step(flaps)
+
+    for bird in range(birds):
+        game = Game(fixed_point=fixed_point)
+        game.reset(seed)
+        game.rng.seed(seed)  # Game also draws colours from its RNG; BatchGame only pipes
+        policy = gap_seeker(game, offsets[bird])
+        state = game.get_state()
+        while game.frame < frames and not game.game_over:
+            state, _, _ = game.step(policy(state))
+        assert game.score == batch.score[bird], bird
+        assert (game.frame if game.game_over else -1) == batch.death_frame[bird], bird
+        if not game.game_over:
+            assert game.bird.y == batch.y[bird]